@@ -195,6 +195,18 @@ The config file is in INI-format divided into a number of sections as outlined b
         list_all_enabled = yes
         # Show older messages from boot onward
         from_boot_enabled = no
+        # Only retain the displayed columns of "Recently notified" entries, full entries are re-read when needed.
+        cursor_only_history_enabled = no
+        # Maintain a trigram index to speed up incremental-search of a long "Recently notified" history.
+        search_index_enabled = no
+        # Collapse consecutive repeats of the same message from the same source into one counted row.
+        collapse_repeats_enabled = no
+        # While editing a filter rule, preview its effect on the last filter_preview_hours of the journal.
+        filter_preview_hours = 24
+        # Queries with a results filter are split by time across this many processes (0 for one per CPU).
+        query_processes = 0
+        # Maintain a full-text index of the journal in ~/.cache/jouno to speed up queries with a results filter.
+        journal_index_enabled = no
         # For debugging the application
         debug_enabled = yes
 
@@ -271,42 +283,62 @@ with this program. If not, see <https://www.gnu.org/licenses/>.
 # TODO refine Apply/Revert and dynamically enable/disable the buttons.
 
 import argparse
+import bisect
 import configparser
 import datetime as DT
 import grp
+import json
+import multiprocessing
 import os
+import pickle
 import pwd
+import queue
 import re
 import select
 import signal
+import sqlite3
 import stat
 import sys
 import textwrap
+import threading
 import time
 import traceback
 import typing
+import uuid
 import weakref
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from concurrent.futures.process import BrokenProcessPool
 from enum import Enum
 from functools import partial
 from html import escape
-from io import StringIO
+from io import StringIO, BytesIO
 from pathlib import Path
-from typing import Mapping, Any, List, Type, Callable, Tuple, Union, Iterator, TextIO
+from typing import Mapping, Any, List, Type, Callable, Tuple, Union, Iterator, TextIO, Optional, Set, Iterable
+
+# The regexp parser is private, without it regexp searches check every entry rather than using the trigram index.
+try:
+    from re import _parser as sre_parse  # Python 3.11 onward
+except ImportError:
+    try:
+        import sre_parse
+    except ImportError:
+        sre_parse = None
 
 import dbus
-import pytz
 from PyQt5.QtCore import QCoreApplication, QProcess, Qt, pyqtSignal, QThread, QModelIndex, QItemSelectionModel, QSize, \
-    QEvent, QSettings, QObject, QItemSelection, QPoint, QDateTime, QDate
+    QAbstractProxyModel, QAbstractTableModel, QAbstractListModel, QTimer, \
+    QEvent, QSettings, QObject, QItemSelection, QItemSelectionRange, QPoint, QDateTime, QDate
 from PyQt5.QtGui import QPixmap, QIcon, QImage, QPainter, QStandardItemModel, QStandardItem, QIntValidator, \
     QFontDatabase, QGuiApplication, QCloseEvent, QPalette, QTextCursor, QColor
 from PyQt5.QtSvg import QSvgRenderer
 from PyQt5.QtWidgets import QApplication, QWidget, QVBoxLayout, QMessageBox, QLineEdit, QLabel, \
-    QPushButton, QSystemTrayIcon, QMenu, QTextEdit, QDialog, QTabWidget, \
+    QPushButton, QSystemTrayIcon, QMenu, QTextEdit, QPlainTextEdit, QDialog, QTabWidget, \
     QCheckBox, QGridLayout, QTableView, \
     QAbstractItemView, QHeaderView, QMainWindow, QSizePolicy, QStyledItemDelegate, QToolBar, QDockWidget, \
     QHBoxLayout, QStyleFactory, QToolButton, QScrollArea, QLayout, QStatusBar, QDateTimeEdit, QCalendarWidget, \
     QFormLayout, QGroupBox, QSpacerItem, QTableWidgetItem, QTableWidget, \
-    QProgressDialog
+    QProgressDialog, QFileDialog, QComboBox, QListView
 from systemd import journal
 
 JOUNO_VERSION = '1.3.6'
@@ -348,6 +380,10 @@ ICON_COPY_SELECTED = 'edit-copy'
 ICON_PLAIN_TEXT_SEARCH = 'insert-text'
 ICON_REGEXP_SEARCH = 'list-add'
 ICON_SETTINGS_CONFIGURE = 'settings-configure'
+ICON_SHOW_MATCHES_ONLY = 'view-filter'
+ICON_VIEW_REPEATS = 'view-list-details'
+ICON_EXPORT = 'document-save-as'
+ICON_AGGREGATE = 'view-statistics'
 
 SVG_LIGHT_THEME_COLOR = b"#232629"
 SVG_DARK_THEME_COLOR = b"#f3f3f3"
@@ -528,6 +564,9 @@ STATUS_TIMEOUT_MSEC = 10000
 STATUS_SHORT_TIMEOUT_MSEC = 5000
 STATUS_LONG_TIMEOUT_MSEC = 30000
 
+# Live entries are applied to the Recent panel at most once per refresh interval (about 30 frames per second).
+REFRESH_INTERVAL_MSEC = 33
+
 ERROR_DBUS_NOTIFICATIONS_UNAVAILABLE = "DBUS notification service unavailable"
 ERROR_DBUS_NOTIFICATION_FAILED = "DBUS notification failed"
 
@@ -546,6 +585,12 @@ dark_tray_enabled = no
 start_with_notifications_enabled = yes
 list_all_enabled = no
 forward_session_log_enabled = no
+cursor_only_history_enabled = no
+search_index_enabled = no
+collapse_repeats_enabled = no
+filter_preview_hours = 24
+query_processes = 0
+journal_index_enabled = no
 debug_enabled = no
 query_field_list = {' '.join(DEFAULT_QUERY_FIELDS)}
 
@@ -593,6 +638,25 @@ CONFIG_OPTIONS_LIST: List[ConfigOption] = [
     ConfigOption('from_boot_enabled', 'Show old journal entries from boot onward.'),
     ConfigOption('forward_session_log_enabled',
                  'Forward xorg-session.log or wayland-session.log to the systemd-journal (if it exists).'),
+    ConfigOption('cursor_only_history_enabled',
+                 'The Recent notifications panel should only retain the displayed columns of each entry, '
+                 'the full entry is re-read from the journal when it is viewed or copied '
+                 '(incremental-search only covers the displayed columns).'),
+    ConfigOption('search_index_enabled',
+                 'Index the Recent notifications panel to speed up incremental-search of long histories '
+                 '(uses considerably more memory).'),
+    ConfigOption('collapse_repeats_enabled',
+                 'The Recent notifications panel should collapse consecutive repeats of the same message from '
+                 'the same source into one row with a repeat count (right-mouse to view the repeats).'),
+    ConfigOption('filter_preview_hours',
+                 'While editing a filter rule, count the entries it would match in the most recent '
+                 'hours of the journal ({}..{} hours).', (1, 8760)),
+    ConfigOption('query_processes',
+                 'Split queries that have a results filter into time partitions run by this many processes, '
+                 'zero for one per CPU, one to disable ({}..{} processes).', (0, 64)),
+    ConfigOption('journal_index_enabled',
+                 'Follow the journal into a full-text index in ~/.cache/jouno, queries with a plain text results '
+                 'filter use the index to find their results (uses disk space in proportion to the journal).'),
     ConfigOption('debug_enabled', 'Enable extra debugging output to standard-out.'),
     ConfigOption('query_field_list', 'Default query fields.'),
 ]
@@ -686,6 +750,13 @@ def get_config_path() -> Path:
     return path
 
 
+def get_cache_path(name: str) -> Path:
+    cache_dir_path = Path.home().joinpath('.cache').joinpath('jouno')
+    if not cache_dir_path.is_dir():
+        os.makedirs(cache_dir_path)
+    return cache_dir_path.joinpath(name)
+
+
 class Config(configparser.ConfigParser):
 
     def __init__(self):
@@ -746,6 +817,46 @@ def consolidate_text(journal_entry):
     return fields_str
 
 
+class JournalRowRecord:
+    """A journal entry with its Recent panel column text preformatted off the GUI thread."""
+
+    def __init__(self, journal_entry: Mapping[str, Any], notable: bool):
+        self.journal_entry = journal_entry
+        self.notable = notable
+        consolidated_text = journal_entry[JOUNO_CONSOLIDATED_TEXT_KEY]
+        self.time_text = f"{journal_entry['__REALTIME_TIMESTAMP']:%y-%m-%d %H:%M:%S}"
+        self.host_text = journal_entry['_HOSTNAME'] if '_HOSTNAME' in journal_entry else 'UNKNOWN'
+        self.source_text = extract_source_from_considated_text(consolidated_text)
+        # TODO smarter choice when _PID is not present.
+        self.pid_text = str(journal_entry['_PID'] if '_PID' in journal_entry else '')
+        self.message_text = str(journal_entry['MESSAGE']) if 'MESSAGE' in journal_entry else ''
+        self.size_text = f"{len(consolidated_text) / 1024.0:.2f}"
+        priority = journal_entry['PRIORITY'] if 'PRIORITY' in journal_entry else Priority.NOTICE.value
+        if not Priority.EMERGENCY.value <= priority <= Priority.DEBUG.value:
+            priority = Priority.NOTICE.value
+        self.icon_name = NOTIFICATION_ICONS[Priority(priority)]
+        # Non-notable entries use a "disabled" version of the normal icon.
+        self.icon_key = self.icon_name if notable else self.icon_name + "_non_notable"
+
+    def is_repeat_of(self, other: 'JournalRowRecord') -> bool:
+        return self.message_text == other.message_text and self.source_text == other.source_text \
+            and self.host_text == other.host_text and self.icon_key == other.icon_key
+
+
+def compile_filter_patterns(rules_map: Mapping[str, str], patterns_map: Mapping[str, re.Pattern]):
+    for rule_id, rule_text in rules_map.items():
+        if rule_id.endswith('_enabled'):
+            pass
+        else:
+            rule_enabled_key = rule_id + "_enabled"
+            re_indicator_key = rule_id + "_regexp_enabled"
+            if rule_enabled_key not in rules_map or rules_map[rule_enabled_key].lower() == 'yes':
+                if re_indicator_key in rules_map and rules_map[re_indicator_key].lower() == 'yes':
+                    patterns_map[rule_id] = re.compile(rule_text, flags=re.DOTALL)
+                else:
+                    patterns_map[rule_id] = re.compile(re.escape(rule_text), flags=re.DOTALL)
+
+
 def determine_priority(journal_entries: List[Mapping[str, Any]]) -> Priority:
     current_level = Priority.NOTICE
     for journal_entry in journal_entries:
@@ -812,17 +923,7 @@ class JournalWatcher:
         self.compile_patterns(self.config['ignore'], self.ignore_regexp)
 
     def compile_patterns(self, rules_map: Mapping[str, str], patterns_map: Mapping[str, re.Pattern]):
-        for rule_id, rule_text in rules_map.items():
-            if rule_id.endswith('_enabled'):
-                pass
-            else:
-                rule_enabled_key = rule_id + "_enabled"
-                re_indicator_key = rule_id + "_regexp_enabled"
-                if rule_enabled_key not in rules_map or rules_map[rule_enabled_key].lower() == 'yes':
-                    if re_indicator_key in rules_map and rules_map[re_indicator_key].lower() == 'yes':
-                        patterns_map[rule_id] = re.compile(rule_text, flags=re.DOTALL)
-                    else:
-                        patterns_map[rule_id] = re.compile(re.escape(rule_text), flags=re.DOTALL)
+        compile_filter_patterns(rules_map, patterns_map)
 
     def determine_source(self, journal_entry):
         for key in ['_COMM', '_EXE', '_CMDLINE', '_KERNEL_SUBSYSTEM', 'SYSLOG_IDENTIFIER', ]:
@@ -953,7 +1054,7 @@ class JournalWatcher:
                             notable = self.is_notable(consolidate_text(journal_entry))
                             notable_list.append(journal_entry) if notable else None
                             if notable or self.forward_all:
-                                self.supervisor.new_journal_entry(journal_entry, notable)
+                                self.supervisor.new_journal_entry(JournalRowRecord(journal_entry, notable))
                 if self.notifications_enabled and len(notable_list):
                     try:
                         notifier.notify_desktop(app_name=self.determine_app_names(notable_list),
@@ -981,7 +1082,7 @@ class JournalWatcher:
         for journal_entry in journal_reader:
             notable = self.is_notable(consolidate_text(journal_entry))
             if notable or self.forward_all:
-                results.append((journal_entry, notable,))
+                results.append(JournalRowRecord(journal_entry, notable))
                 count += 1
                 if self.max_historical_entries != 0 and count > self.max_historical_entries:
                     results.pop(0)
@@ -1113,6 +1214,20 @@ def create_disabled_icon_from_themed_icon(themed_icon):
     return new_icon
 
 
+row_icon_cache: Mapping[str, QIcon] = {}
+
+
+def get_row_record_icon(row_record: 'JournalRowRecord') -> QIcon:
+    if row_record.icon_key in row_icon_cache:
+        return row_icon_cache[row_record.icon_key]
+    icon = QIcon.fromTheme(row_record.icon_name)
+    row_icon_cache[row_record.icon_name] = icon
+    if row_record.icon_key != row_record.icon_name:
+        icon = create_disabled_icon_from_themed_icon(icon)
+        row_icon_cache[row_record.icon_key] = icon
+    return icon
+
+
 managed_svg_icon_source: Mapping[QObject, str] = weakref.WeakKeyDictionary()
 themed_icon_cache: Mapping[Union[str, bytes], QIcon] = {}
 
@@ -1371,6 +1486,18 @@ class ConfigPanel(DockableWidget):
         self.status_bar = StatusBar()
         self.status_bar.addPermanentWidget(button_box)
 
+        # Previewing waits for a pause in typing, then runs in the background, newer edits supersede older ones.
+        self.preview_request = None
+        self.preview_generation = 0
+        self.filter_preview_task = FilterPreviewTask()
+        self.filter_preview_task.signal_preview_progress.connect(self.filter_preview_progress)
+        self.filter_preview_task.signal_preview_finished.connect(self.filter_preview_finished)
+        self.filter_preview_task.start()
+        self.filter_preview_timer = QTimer(self)
+        self.filter_preview_timer.setSingleShot(True)
+        self.filter_preview_timer.setInterval(500)
+        self.filter_preview_timer.timeout.connect(self.start_filter_preview)
+
         def save_action():
             debug("save action") if debugging else None
             try:
@@ -1477,6 +1604,42 @@ class ConfigPanel(DockableWidget):
         self.config_watcher.signal_config_change.connect(config_change)
         self.config_watcher.start()
 
+    def edit_filter_pattern(self, pattern: str, pattern_is_regexp: bool, filter_type: str, rule_id: str):
+        self.preview_request = (pattern, pattern_is_regexp, filter_type, rule_id)
+        self.filter_preview_timer.start()
+
+    def stop_filter_preview(self) -> None:
+        self.filter_preview_timer.stop()
+        self.preview_generation = self.filter_preview_task.cancel()
+        self.filter_preview_task.stop()
+
+    def start_filter_preview(self):
+        pattern, pattern_is_regexp, filter_type, rule_id = self.preview_request
+        # Ask the JournalPanel to select/highlight matches.
+        self.signal_editing_filter_pattern.emit(pattern, pattern_is_regexp)
+        if pattern == '':
+            self.preview_generation = self.filter_preview_task.cancel()
+            return
+        regexp = re.compile(pattern if pattern_is_regexp else re.escape(pattern), flags=re.DOTALL)
+        hours = self.config.getint('options', 'filter_preview_hours', fallback=24)
+        self.preview_generation = self.filter_preview_task.preview(regexp, filter_type, rule_id, hours)
+        self.status_bar.show_progress(tr("Previewing rule over the last {} hours...").format(hours))
+
+    def filter_preview_progress(self, generation: int, scanned_count: int, hit_count: int):
+        if generation == self.preview_generation:
+            self.status_bar.show_progress(
+                tr("Previewing: {} hits in {} entries so far...").format(hit_count, scanned_count))
+
+    def filter_preview_finished(self, generation: int, scanned_count: int, hit_count: int,
+                                ignore_effect: int, match_effect: int):
+        if generation != self.preview_generation:
+            return
+        hours = self.config.getint('options', 'filter_preview_hours', fallback=24)
+        self.status_bar.show_info(
+            tr("Matches {} of {} entries in the last {} hours - "
+               "as an ignore rule it would newly ignore {}, as a match rule it would newly notify {}.").format(
+                hit_count, scanned_count, hours, ignore_effect, match_effect))
+
     def add_dock_control(self, dock_button: QPushButton):
         self.title_layout.addWidget(dock_button)
 
@@ -1631,23 +1794,25 @@ class FilterValidationException(Exception):
 
 class FilterPatternEntryDelegate(QStyledItemDelegate):
 
-    def __init__(self, model: FilterTableModel, config_panel: 'ConfigPanel'):
+    def __init__(self, model: FilterTableModel, config_panel: 'ConfigPanel', filter_type: str):
         super().__init__(model)
         self.model = model
         self.config_panel = config_panel
+        self.filter_type = filter_type
         self.line_edit = None
 
     def createEditor(self, parent, option, index):
         self.line_edit = QLineEdit(parent)
 
         def text_changed(pattern: str):
-            # Ask the JournalPanel to select/highlight partial matches as the user types.
+            # Ask for a preview of the draft pattern's matches once the user pauses typing.
             pattern = pattern.strip()
             pattern_is_regexp = self.model.itemFromIndex(index).checkState()
+            rule_id = self.model.item(index.row(), 0).text()
             try:
                 if pattern_is_regexp:
                     re.compile(pattern, flags=re.DOTALL)
-                self.config_panel.signal_editing_filter_pattern.emit(pattern, pattern_is_regexp)
+                self.config_panel.edit_filter_pattern(pattern, pattern_is_regexp, self.filter_type, rule_id)
             except re.error as e:
                 self.config_panel.status_bar.show_error(str(e), STATUS_TIMEOUT_MSEC)
 
@@ -1672,7 +1837,7 @@ class FilterTableView(QTableView):
         self.horizontalHeader().setSectionResizeMode(1, QHeaderView.Stretch)
         self.horizontalHeader().setDefaultAlignment(Qt.AlignLeft)
         self.setShowGrid(False)
-        self.setItemDelegateForColumn(1, FilterPatternEntryDelegate(self.model(), config_panel))
+        self.setItemDelegateForColumn(1, FilterPatternEntryDelegate(self.model(), config_panel, config_section.name))
 
     def item_view_order(self) -> List[int]:
         """
@@ -1845,6 +2010,74 @@ class FilterTableView(QTableView):
                 self.selectRow(model.rowCount() - 1)
 
 
+class FilterPreviewTask(QThread):
+    """Counts the entries a draft filter rule would match in recent hours, split by ignore and match effect."""
+    signal_preview_progress = pyqtSignal(int, int, int)
+    signal_preview_finished = pyqtSignal(int, int, int, int, int)
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.requests = queue.Queue()
+        self.generation = 0
+        self.stopped = False
+
+    def preview(self, regexp: re.Pattern, filter_type: str, rule_id: str, hours: int) -> int:
+        self.generation += 1
+        self.requests.put((self.generation, regexp, filter_type, rule_id, hours))
+        return self.generation
+
+    def cancel(self) -> int:
+        self.generation += 1
+        return self.generation
+
+    def stop(self) -> None:
+        """Abandon any preview in progress and wait for the thread to end."""
+        self.stopped = True
+        self.cancel()
+        self.requests.put(None)
+        self.wait()
+
+    def run(self) -> None:
+        while not self.stopped:
+            request = self.requests.get()
+            if request is None:
+                return
+            generation, regexp, filter_type, rule_id, hours = request
+            if generation == self.generation:
+                self.preview_journal(generation, regexp, filter_type, rule_id, hours)
+
+    def preview_journal(self, generation: int, regexp: re.Pattern, filter_type: str, rule_id: str, hours: int):
+        config = Config()
+        config.refresh()
+        ignore_regexp: Mapping[str, re.Pattern] = {}
+        match_regexp: Mapping[str, re.Pattern] = {}
+        compile_filter_patterns(config['ignore'], ignore_regexp)
+        compile_filter_patterns(config['match'], match_regexp)
+        (ignore_regexp if filter_type == 'ignore' else match_regexp).pop(rule_id, None)
+        scanned_count = hit_count = ignore_effect = match_effect = 0
+        last_emit_time = time.time()
+        with journal.Reader() as journal_reader:
+            journal_reader.seek_realtime(DT.datetime.now() - DT.timedelta(hours=hours))
+            for journal_entry in journal_reader:
+                if generation != self.generation:
+                    return
+                fields_str = consolidate_text(journal_entry)
+                scanned_count += 1
+                if regexp.search(fields_str) is not None:
+                    hit_count += 1
+                    ignored = any(ignore_re.search(fields_str) is not None for ignore_re in ignore_regexp.values())
+                    rescued = any(match_re.search(fields_str) is not None for match_re in match_regexp.values())
+                    if not ignored and not rescued:
+                        ignore_effect += 1
+                    elif ignored and not rescued:
+                        match_effect += 1
+                if scanned_count % 1000 == 0 and time.time() - last_emit_time > 0.25:
+                    self.signal_preview_progress.emit(generation, scanned_count, hit_count)
+                    last_emit_time = time.time()
+        debug(f"filter preview {scanned_count=} {hit_count=}") if debugging else None
+        self.signal_preview_finished.emit(generation, scanned_count, hit_count, ignore_effect, match_effect)
+
+
 class ConfigWatcherTask(QThread):
     signal_config_change = pyqtSignal()
 
@@ -1863,7 +2096,7 @@ class ConfigWatcherTask(QThread):
 class JournalWatcherTask(QThread):
     signal_historical_entries = pyqtSignal(list)
     signal_historical_progress = pyqtSignal(int)
-    signal_new_entry = pyqtSignal(dict, bool)
+    signal_new_entry = pyqtSignal(object)
     signal_error = pyqtSignal(str, Exception)
 
     def __init__(self) -> None:
@@ -1885,8 +2118,8 @@ class JournalWatcherTask(QThread):
     def run(self) -> None:
         self.watcher.watch_journal()
 
-    def new_journal_entry(self, journal_entry: Mapping, notable: bool):
-        self.signal_new_entry.emit(journal_entry, notable)
+    def new_journal_entry(self, row_record: JournalRowRecord):
+        self.signal_new_entry.emit(row_record)
 
     def deliver_historical_entries(self, history_list: List):
         self.signal_historical_entries.emit(history_list)
@@ -1895,6 +2128,103 @@ class JournalWatcherTask(QThread):
         self.signal_historical_progress.emit(count)
 
 
+JOURNAL_INDEX_BATCH_ENTRIES = 5000
+JOURNAL_INDEX_PRUNE_SECONDS = 3600
+
+
+def prune_journal_index(index: 'JournalIndex') -> None:
+    """Remove entries older than the journal's first entry, they have been vacuumed."""
+    with journal.Reader(converters={'__REALTIME_TIMESTAMP': int}) as head_reader:
+        head_reader.seek_head()
+        first_entry = head_reader.get_next()
+        if first_entry is not None and len(first_entry) != 0:
+            index.remove_before(first_entry['__REALTIME_TIMESTAMP'])
+
+
+def follow_journal_into_index(stop_event: multiprocessing.Event) -> None:
+    """Follows the journal into the JournalIndex, resuming from the last entry indexed, until stop_event is set."""
+    # Run in a separate process, decoding and consolidating every entry would otherwise hold the GUI's GIL.
+    try:
+        index = JournalIndex()
+    except sqlite3.Error as e:
+        # For example, an SQLite without FTS5 or its trigram tokenizer, queries will scan the journal instead.
+        warning(f"Journal index: cannot be opened, not indexing: {e}")
+        return
+    rows = []
+    try:
+        prune_journal_index(index)
+        prune_time = time.time()
+        with journal.Reader(converters={'__REALTIME_TIMESTAMP': int}) as reader:
+            last_cursor = index.last_cursor()
+            if last_cursor is None:
+                reader.seek_head()
+            else:
+                reader.seek_cursor(last_cursor)
+                resume_entry = reader.get_next()
+                # If the indexed entry has been vacuumed, the seek lands on the next entry, which is new.
+                if resume_entry is not None and len(resume_entry) != 0 and not reader.test_cursor(last_cursor):
+                    rows.append(journal_index_row(resume_entry))
+            info(f"Journal index: following the journal into {index.path}")
+            while not stop_event.is_set():
+                journal_entry = reader.get_next()
+                if journal_entry is None or len(journal_entry) == 0:
+                    index.add_entries(rows)
+                    rows = []
+                    # The journal is vacuumed while the indexer runs, which may be for days.
+                    if time.time() - prune_time >= JOURNAL_INDEX_PRUNE_SECONDS:
+                        prune_journal_index(index)
+                        prune_time = time.time()
+                    reader.wait(1.0)
+                    continue
+                rows.append(journal_index_row(journal_entry))
+                if len(rows) >= JOURNAL_INDEX_BATCH_ENTRIES:
+                    index.add_entries(rows)
+                    rows = []
+    except (OSError, sqlite3.Error) as e:
+        warning(f"Journal index: stopped indexing: {e}")
+    finally:
+        try:
+            index.add_entries(rows)
+        except sqlite3.Error as e:
+            warning(f"Journal index: failed to save the last {len(rows)} entries: {e}")
+        index.close()
+
+
+class JournalIndexer:
+    STOP_TIMEOUT_SECONDS = 5.0
+
+    def __init__(self):
+        self.index_process: Optional[multiprocessing.Process] = None
+        self.stop_event: Optional[multiprocessing.Event] = None
+
+    def enable(self, enable: bool):
+        if enable:
+            if self.is_enabled():
+                return
+            if self.index_process is not None:
+                # A previous indexer is still saving its last batch, it must finish before another can write.
+                self.index_process.join()
+            context = multiprocessing.get_context('spawn')
+            self.stop_event = context.Event()
+            self.index_process = context.Process(target=follow_journal_into_index, args=(self.stop_event,),
+                                                 daemon=True)
+            self.index_process.start()
+        elif self.index_process is not None:
+            self.stop_event.set()
+
+    def is_enabled(self) -> bool:
+        return self.index_process is not None and self.index_process.is_alive() and not self.stop_event.is_set()
+
+    def stop(self):
+        """Stop indexing and wait a while for the indexer to save what it has read."""
+        if self.index_process is not None:
+            self.stop_event.set()
+            self.index_process.join(JournalIndexer.STOP_TIMEOUT_SECONDS)
+            if self.index_process.is_alive():
+                self.index_process.terminate()
+            self.index_process = None
+
+
 class SessionLogForwarder:
     def __init__(self, main_window: QMainWindow):
         self.main_window = main_window
@@ -2155,6 +2485,8 @@ class MainWindow(QMainWindow):
         self.setObjectName('main_window')
         self.geometry_key = self.objectName() + "_geometry"
         self.state_key = self.objectName() + "_window_state"
+        self.query_metadata: Optional[QueryMetaData] = None
+        self.query_metadata_task: Optional[QueryMetaDataTask] = None
 
         journal_watcher_task = JournalWatcherTask()
         info('QStyleFactory.keys()=', QStyleFactory.keys())
@@ -2175,6 +2507,7 @@ class MainWindow(QMainWindow):
         app.setAttribute(Qt.AA_UseHighDpiPixmaps)
 
         xorg_session_forwarder = SessionLogForwarder(self)
+        self.journal_indexer = journal_indexer = JournalIndexer()
 
         self.settings = QSettings('jouno.qt.state', 'jouno')
 
@@ -2221,6 +2554,9 @@ class MainWindow(QMainWindow):
 
         def quit_app() -> None:
             journal_watcher_task.requestInterruption()
+            journal_indexer.stop()
+            journal_panel.stop_search_task()
+            config_panel.stop_filter_preview()
             self.app_save_state()
             app.quit()
 
@@ -2229,12 +2565,20 @@ class MainWindow(QMainWindow):
 
         def config_change() -> None:
             journal_panel.set_max_entries(config_panel.get_config().getint('options', 'journal_history_max'))
+            journal_panel.set_cursor_only(
+                config_panel.get_config().getboolean('options', 'cursor_only_history_enabled', fallback=False))
+            journal_panel.set_search_index_enabled(
+                config_panel.get_config().getboolean('options', 'search_index_enabled', fallback=False))
+            journal_panel.set_collapse_repeats(
+                config_panel.get_config().getboolean('options', 'collapse_repeats_enabled', fallback=False))
             global debugging
             debugging = config_panel.get_config().getboolean('options', 'debug_enabled')
             self.config_panel.status_bar.show_info(tr("Applying configuration changes."), STATUS_SHORT_TIMEOUT_MSEC)
             self.journal_panel.static_status_label.setText("")
             xorg_session_forwarder.enable(
                 config_panel.get_config().getboolean('options', 'forward_session_log_enabled', fallback=False))
+            journal_indexer.enable(
+                config_panel.get_config().getboolean('options', 'journal_index_enabled', fallback=False))
             if self.use_system_tray():
                 if not tray.isVisible():
                     tray.setVisible(True)
@@ -2269,7 +2613,16 @@ class MainWindow(QMainWindow):
             config_panel.delete_filter()
 
         def query_journal() -> None:
-            QueryInitializeWidget(parent=self)
+            if self.query_metadata is None:
+                if self.query_metadata_task is not None and self.query_metadata_task.isRunning() \
+                        and not self.query_metadata_task.stopped:
+                    # The first refresh is under way, and its progress dialog is already waiting on it.
+                    return
+                QueryInitializeWidget(parent=self)
+                return
+            # Open on the metadata already known, the refresh brings it up to date in the background.
+            QueryJournalWidget(self.query_metadata, parent=self)
+            self.get_query_metadata_task().refresh()
 
         def settings_edit() -> None:
             self.config_dock_container.undock_and_show()
@@ -2282,19 +2635,24 @@ class MainWindow(QMainWindow):
 
         self.journal_panel = journal_panel = JournalPanel(
             max_entries=config_panel.get_config().getint('options', 'journal_history_max'))
+        journal_panel.set_cursor_only(
+            config_panel.get_config().getboolean('options', 'cursor_only_history_enabled', fallback=False))
+        journal_panel.set_search_index_enabled(
+            config_panel.get_config().getboolean('options', 'search_index_enabled', fallback=False))
+        journal_panel.set_collapse_repeats(
+            config_panel.get_config().getboolean('options', 'collapse_repeats_enabled', fallback=False))
         self.journal_dock_container = DockContainer(
             dockable_widget=journal_panel, home_window=self, home_dock_area=Qt.DockWidgetArea.TopDockWidgetArea)
 
-        def new_journal_entry(entry, notable: bool):
-            self.journal_panel.new_journal_entry(entry, notable)
+        def new_journal_entry(row_record: JournalRowRecord):
+            self.journal_panel.new_journal_entry(row_record)
 
-        def process_historical_entries(historical_entries: List[Tuple]):
+        def process_historical_entries(historical_entries: List[JournalRowRecord]):
             self.journal_panel.journal_status_bar.show_info(tr("Initialising..."))
-            for entry, notable in historical_entries:
-                self.journal_panel.add_journal_entry(entry, notable)
+            self.journal_panel.add_journal_entries(historical_entries)
             self.journal_panel.journal_status_bar.showMessage('')
             # Scroll to bottom to await new entries
-            self.journal_panel.new_journal_entry(None, False)
+            self.journal_panel.new_journal_entry(None)
 
         def process_progress(count: int):
             self.journal_panel.journal_status_bar.show_progress(tr("Scanned {} entries").format(count))
@@ -2349,6 +2707,7 @@ class MainWindow(QMainWindow):
 
         xorg_session_forwarder.enable(
             config_panel.get_config().getboolean('options', 'forward_session_log_enabled', fallback=False))
+        journal_indexer.enable(config_panel.get_config().getboolean('options', 'journal_index_enabled', fallback=False))
 
         if len(self.settings.allKeys()) == 0:
             # First run or qt settings have been erased - guess at sizes and locations
@@ -2406,6 +2765,23 @@ class MainWindow(QMainWindow):
             self.journal_dock_container.activate_dock_window()
             self.config_dock_container.activate_dock_window()
 
+    def get_query_metadata_task(self) -> 'QueryMetaDataTask':
+        if self.query_metadata_task is None:
+            self.query_metadata_task = QueryMetaDataTask()
+
+            def boots_ready_func(changed_boots: Mapping[Any, Tuple[DT.datetime, DT.datetime, bool]],
+                                 removed_boot_ids: List[Any]):
+                if self.query_metadata is None:
+                    self.query_metadata = QueryMetaData()
+                self.query_metadata.update_boots(changed_boots, removed_boot_ids)
+
+            def field_values_ready_func(field_name: str, field_values: List[QueryFieldValue]):
+                self.query_metadata.add_field_values(field_name, field_values)
+
+            self.query_metadata_task.boots_ready.connect(boots_ready_func)
+            self.query_metadata_task.field_values_ready.connect(field_values_ready_func)
+        return self.query_metadata_task
+
     def use_system_tray(self):
         return is_system_tray_available() and \
                self.config_panel.get_config().getboolean('options', 'system_tray_enabled')
@@ -2439,7 +2815,7 @@ class JournalPanel(DockableWidget):
         self.setObjectName("journal-panel")
 
         self.table_view = JournalTableView()
-        self.table_view.model().set_max_entries(max_entries)
+        self.table_view.journal_model.set_max_entries(max_entries)
 
         self.listening_for_new_entries = False
 
@@ -2460,18 +2836,28 @@ class JournalPanel(DockableWidget):
         self.re_search_enabled = False
 
         def search_entries(text: str) -> None:
-            self.scrolled_to_selected = None
             if self.re_search_enabled:
                 try:
                     re.compile(text, flags=re.DOTALL)
                 except re.error as e:
                     self.journal_status_bar.show_error(str(e))
                     return
+            go_next_button.setEnabled(False)
+            go_previous_button.setEnabled(False)
             self.search_select_journal(text, regexp_search=self.re_search_enabled)
-            go_next_button.setEnabled(self.scrolled_to_selected is not None)
-            go_previous_button.setEnabled(self.scrolled_to_selected is not None)
 
-        self.search_start_time = 0
+        self.search_generation = 0
+        self.search_match_count = 0
+        self.search_match_ranges: List[Tuple[int, int]] = []
+        # The same matches as a sorted list of serials, for stepping through them.
+        self.search_matched_serials: List[int] = []
+        self.search_regexp = None
+        self.search_end_serial = 0
+        self.matches_only = False
+        self.search_task = JournalSearchTask()
+        self.search_task.signal_matches.connect(self.search_matched)
+        self.search_task.signal_search_finished.connect(self.search_finished)
+        self.search_task.start()
         search_input = QLineEdit()
         search_input.setFixedWidth(350)
         search_input.addAction(get_themed_icon(ICON_SEARCH_TEXT), QLineEdit.LeadingPosition)
@@ -2495,7 +2881,7 @@ class JournalPanel(DockableWidget):
         search_input.setClearButtonEnabled(True)
         self.search_input = search_input
         title_layout.addWidget(search_input)
-        self.scrolled_to_selected = None
+        self.scrolled_to_serial = None
 
         go_next_button = transparent_button(manage_icon(QPushButton('', self), ICON_GO_NEXT))
         go_next_button.clicked.connect(partial(self.scroll_selected, 1))
@@ -2508,6 +2894,14 @@ class JournalPanel(DockableWidget):
         go_previous_button.setToolTip(tr("Previous match."))
         go_previous_button.setEnabled(False)
         title_layout.addWidget(go_previous_button)
+        self.go_next_button = go_next_button
+        self.go_previous_button = go_previous_button
+
+        matches_only_button = transparent_button(manage_icon(QPushButton('', self), ICON_SHOW_MATCHES_ONLY))
+        matches_only_button.setCheckable(True)
+        matches_only_button.toggled.connect(self.set_matches_only)
+        matches_only_button.setToolTip(tr("Show only the entries matched by the search."))
+        title_layout.addWidget(matches_only_button)
 
         self.title_layout = title_layout
 
@@ -2530,13 +2924,24 @@ class JournalPanel(DockableWidget):
         layout.addWidget(self.journal_status_bar)
         self.static_status_label.setText(tr(""))
 
+        # New entries are queued and applied in one go per refresh, so a burst doesn't redraw for every entry.
+        self.pending_entries: List[JournalRowRecord] = []
+        self.export_task: Optional[ExportJournalTask] = None
+        self.pending_scroll_to_bottom = False
+        self.refresh_due_time = 0.0
+        self.refresh_metrics = RefreshMetrics()
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setSingleShot(True)
+        self.refresh_timer.setInterval(REFRESH_INTERVAL_MSEC)
+        self.refresh_timer.timeout.connect(self.refresh_pending)
+
         def view_journal_entry_at_row_number(row: int):
             if row < 0 and (self.table_view.model().rowCount() > 0):
                 row = self.table_view.model().rowCount() - 1
                 self.journal_status_bar.show_info(tr("Viewing last entry."), STATUS_SHORT_TIMEOUT_MSEC)
             if row >= 0:
-                journal_entry = self.table_view.model().get_journal_entry(row)
-                # entry_dialog = JournalEntryDialogPlain(self, self.table_view.model().get_journal_entry(row), row)
+                journal_entry = self.table_view.get_journal_entry(row)
+                # entry_dialog = JournalEntryDialogPlain(self, self.table_view.get_journal_entry(row), row)
                 # entry_dialog.show()
                 window_title = tr("Recent Entry #{row} \u2014 {entry}").format(
                     row=row + 1,
@@ -2564,28 +2969,59 @@ class JournalPanel(DockableWidget):
                 if self.context_menu_index is not None and self.context_menu_index.row() >= 0:
                     row = self.context_menu_index.row()
                     print('copy a row', row)
-                    text = format_journal_entry(self.table_view.model().get_journal_entry(row))
+                    text = format_journal_entry(self.table_view.get_journal_entry(row))
                     self.journal_status_bar.show_info(tr("Copied the entry {} to the clipboard.").format(row + 1),
                                                         STATUS_TIMEOUT_MSEC)
                 else:
                     if self.table_view.model().rowCount() > 0:
                         row = self.table_view.model().rowCount() - 1
-                        text = format_journal_entry(self.table_view.model().get_journal_entry(row))
+                        text = format_journal_entry(self.table_view.get_journal_entry(row))
                         self.journal_status_bar.show_info(tr("Copied last entry."), STATUS_TIMEOUT_MSEC)
                     else:
                         self.journal_status_bar.show_error(tr("No entries available."), STATUS_TIMEOUT_MSEC)
                         text = ''
             else:
-                for index in selected:
-                    text += format_journal_entry(self.table_view.model().get_journal_entry(index.row())) + '\n'
-                self.journal_status_bar.show_info(
-                    tr("Copied {} entries to the clipboard.").format(len(selected)), STATUS_TIMEOUT_MSEC)
+                self.export_rows([index.row() for index in selected], 'text', None)
+                return
             QApplication.clipboard().setText(text)
 
+        def export_entries(selected_only: bool):
+            if selected_only:
+                rows = [index.row() for index in self.table_view.selectionModel().selectedRows()]
+                if len(rows) == 0:
+                    self.journal_status_bar.show_warning(tr("No entries are selected."), STATUS_TIMEOUT_MSEC)
+                    return
+            else:
+                rows = range(self.table_view.model().rowCount())
+            export_filters = {tr("Text (*.txt)"): 'text', tr("JSON lines (*.jsonl)"): 'json',
+                              tr("Journal export format (*.export)"): 'export'}
+            file_name, selected_filter = QFileDialog.getSaveFileName(
+                self, tr("Export entries"), str(Path.home()), ';;'.join(export_filters.keys()))
+            if file_name != '':
+                self.export_rows(rows, export_filters.get(selected_filter, 'text'), file_name)
+
+        def view_repeats():
+            row = self.context_menu_index.row()
+            if row < 0:
+                return
+            repeated_entries = self.table_view.journal_model.get_repeated_entries(self.table_view.source_row(row))
+            if len(repeated_entries) == 0:
+                self.journal_status_bar.show_info(tr("Entry {} has no collapsed repeats.").format(row + 1),
+                                                  STATUS_SHORT_TIMEOUT_MSEC)
+                return
+            journal_entries = [self.table_view.get_journal_entry(row)] + repeated_entries
+            window_title = tr("Repeats of Recent Entry #{row} \u2014 {count} entries").format(
+                row=row + 1, count=len(journal_entries))
+            text = '\n'.join(format_journal_entry(journal_entry) for journal_entry in journal_entries)
+            ViewTextDialog(title=window_title, text=text, static_status=tr("{} entries").format(len(journal_entries)))
+
         context_menu = QMenu(tr("Journal Entry Menu"), parent=self)
         manage_icon(context_menu.addAction(tr('View entry'), view_journal_entry), ICON_VIEW_JOURNAL_ENTRY)
+        manage_icon(context_menu.addAction(tr('View repeats'), view_repeats), ICON_VIEW_REPEATS)
         context_menu.addSeparator()
         manage_icon(context_menu.addAction(tr('Copy selected'), copy_selected), ICON_COPY_SELECTED)
+        manage_icon(context_menu.addAction(tr('Export selected...'), partial(export_entries, True)), ICON_EXPORT)
+        manage_icon(context_menu.addAction(tr('Export all...'), partial(export_entries, False)), ICON_EXPORT)
         manage_icon(context_menu.addAction(tr('Clear selection'), self.table_view.clearSelection), ICON_CLEAR_SELECTION)
 
         self.context_menu_index = None
@@ -2603,107 +3039,236 @@ class JournalPanel(DockableWidget):
     def add_dock_control(self, dock_button: QPushButton):
         self.title_layout.addWidget(dock_button)
 
-    def add_journal_entry(self, journal_entry, notable):
-        self.table_view.new_journal_entry(journal_entry, notable)
-
-    def new_journal_entry(self, journal_entry, notable):
-        if journal_entry is not None:
-            scroll_bar = self.table_view.verticalScrollBar()
-            at_bottom = scroll_bar.value() == scroll_bar.maximum()
-            self.add_journal_entry(journal_entry, notable)
-            message = journal_entry['MESSAGE']
-            if self.search_input.text().strip() == '':
-                self.journal_status_bar.show_info(
-                    tr("New entry. Message={}{}").format(message[0:80], ' ...' if len(message) > 120 else ''),
-                    STATUS_TIMEOUT_MSEC)
-                if at_bottom:
-                    self.table_view.scrollToBottom()
-            else:
-                self.journal_status_bar.show_warning(
-                    tr("New entry (scrolling prevented by search text). Message={}{}").format(
-                        journal_entry['MESSAGE'][0:40], ' ...' if len(message) > 80 else ''))
-            self.static_status_label.setText(
-                tr("{n}/{m}").format(n=self.table_view.model().get_num_entries(),
-                                     m=self.table_view.model().get_max_entries()))
+    def add_journal_entry(self, row_record: JournalRowRecord):
+        self.table_view.new_journal_entry(row_record)
+
+    def add_journal_entries(self, row_records: List[JournalRowRecord]):
+        self.table_view.new_journal_entries(row_records)
+
+    def new_journal_entry(self, row_record: Optional[JournalRowRecord]):
+        if row_record is not None:
+            self.pending_entries.append(row_record)
         else:
+            self.pending_scroll_to_bottom = True
+        if not self.refresh_timer.isActive():
+            self.refresh_due_time = time.monotonic() + REFRESH_INTERVAL_MSEC / 1000.0
+            self.refresh_timer.start()
+
+    def refresh_pending(self):
+        """Apply all the queued entries, then update the status, counter and scroll position once."""
+        lateness_millis = (time.monotonic() - self.refresh_due_time) * 1000.0
+        pending_entries = self.pending_entries
+        self.pending_entries = []
+        self.refresh_metrics.record_frame(len(pending_entries), lateness_millis)
+        if self.pending_scroll_to_bottom:
+            self.pending_scroll_to_bottom = False
             self.table_view.scrollToBottom()
+        if len(pending_entries) == 0:
+            return
+        scroll_bar = self.table_view.verticalScrollBar()
+        at_bottom = scroll_bar.value() == scroll_bar.maximum()
+        self.add_journal_entries(pending_entries)
+        message = pending_entries[-1].message_text
+        count_text = tr("{} new entries. ").format(len(pending_entries)) if len(pending_entries) > 1 else ''
+        if self.search_input.text().strip() == '':
+            self.journal_status_bar.show_info(
+                tr("{}New entry. Message={}{}").format(count_text, message[0:80], ' ...' if len(message) > 120 else ''),
+                STATUS_TIMEOUT_MSEC)
+            if at_bottom:
+                self.table_view.scrollToBottom()
+        else:
+            self.journal_status_bar.show_warning(
+                tr("{}New entry (scrolling prevented by search text). Message={}{}").format(
+                    count_text, message[0:40], ' ...' if len(message) > 80 else ''))
+        self.static_status_label.setText(
+            tr("{n}/{m}").format(n=self.table_view.journal_model.get_num_entries(),
+                                 m=self.table_view.journal_model.get_max_entries()))
+        self.static_status_label.setToolTip(str(self.refresh_metrics))
+
+    def export_rows(self, view_rows: Iterable[int], export_format: str, file_name: Optional[str]):
+        """Export in the background to file_name, or to the clipboard if file_name is None."""
+        if self.export_task is not None and self.export_task.isRunning():
+            self.journal_status_bar.show_warning(tr("An export is already in progress."), STATUS_TIMEOUT_MSEC)
+            return
+        model = self.table_view.journal_model
+        # Only references to the retained entries are gathered here, the task does the formatting.
+        journal_entries = []
+        for row in sorted(view_rows):
+            source_row = self.table_view.source_row(row)
+            journal_entry = model.get_retained_entry(source_row)
+            journal_entries.append(journal_entry)
+            # The repeats folded into a collapsed row are re-read by the task.
+            for cursor in model.get_repeat_cursors(source_row):
+                journal_entries.append(CursorOnlyJournalEntry(journal_entry, **{'__CURSOR': cursor}))
+        destination = file_name if file_name is not None else tr("the clipboard")
+        export_task = ExportJournalTask(journal_entries, export_format, file_name)
+        # Only shows itself if the export takes a while.
+        progress_dialog = QProgressDialog(tr("Exporting to {}...").format(destination), tr("Cancel"),
+                                          0, len(journal_entries), self)
+        progress_dialog.setWindowTitle(tr("Export entries"))
+        progress_dialog.canceled.connect(export_task.stop)
+
+        def export_progress(count: int, total: int):
+            progress_dialog.setValue(count)
+            self.journal_status_bar.show_progress(
+                tr("Exporting to {}: {}/{} entries...").format(destination, count, total))
+
+        def export_finished(count: int, clipboard_text: str, error_text: str):
+            progress_dialog.canceled.disconnect(export_task.stop)
+            progress_dialog.reset()
+            progress_dialog.deleteLater()
+            if error_text != '':
+                self.journal_status_bar.show_error(tr("Export to {} failed: {}").format(destination, error_text))
+                return
+            if export_task.stopped:
+                self.journal_status_bar.show_warning(
+                    tr("Export to {} canceled after {} entries.").format(destination, count), STATUS_TIMEOUT_MSEC)
+                return
+            if file_name is None:
+                QApplication.clipboard().setText(clipboard_text)
+            self.journal_status_bar.show_info(
+                tr("Exported {} entries to {}.").format(count, destination), STATUS_TIMEOUT_MSEC)
+
+        self.export_task = export_task
+        export_task.signal_export_progress.connect(export_progress)
+        export_task.signal_export_finished.connect(export_finished)
+        export_task.start()
+        self.journal_status_bar.show_progress(tr("Exporting to {}...").format(destination))
 
     def get_selected_journal_entry(self):
         indexes = self.table_view.selectedIndexes()
         if indexes is None or len(indexes) == 0:
             return None
-        return self.table_view.model().get_journal_entry(indexes[-1].row())
+        return self.table_view.get_journal_entry(indexes[-1].row())
 
     def get_last_journal_entry(self):
         if self.table_view.model().rowCount() == 0:
             return None
-        return self.table_view.model().get_journal_entry(self.table_view.model().rowCount() - 1)
+        return self.table_view.get_journal_entry(self.table_view.model().rowCount() - 1)
 
     def clear_all_entries(self):
-        self.table_view.model().remove_all_entries()
+        self.table_view.journal_model.remove_all_entries()
 
     def search_select_journal(self, text: str, regexp_search: bool = False):
-        save_triggers = self.table_view.editTriggers()
-        try:
-            self.table_view.setEditTriggers(QAbstractItemView.NoEditTriggers)
-            self.table_view.clearSelection()
-            if len(text) == 0:
-                self.journal_status_bar.showMessage('')
+        # Searching is done by the search task, which streams back matches to search_matched().
+        self.table_view.clearSelection()
+        self.search_match_count = 0
+        self.search_match_ranges = []
+        self.search_matched_serials = []
+        self.scrolled_to_serial = None
+        if len(text) == 0:
+            self.search_generation = self.search_task.cancel()
+            self.search_regexp = None
+            self.table_view.match_proxy.clear_filter()
+            self.journal_status_bar.showMessage('')
+            return
+        model = self.table_view.journal_model
+        # Assume case-insensitive if all text is in lower case.
+        self.search_regexp = re.compile(text if regexp_search else re.escape(text),
+                                        flags=re.DOTALL | (re.IGNORECASE if text == text.lower() else 0))
+        # The task searches a snapshot, entries added or removed while it runs are dealt with by serial number.
+        self.search_end_serial = model.next_serial
+        if self.matches_only:
+            self.table_view.match_proxy.set_filter(self.search_regexp, self.search_end_serial)
+        self.search_generation = self.search_task.search(
+            self.search_regexp, None if regexp_search else text,
+            model.first_serial, model.journal_entries.copy(), model.find_candidate_rows(text, regexp_search))
+        self.journal_status_bar.show_progress(tr("Searching..."))
+
+    def search_matched(self, generation: int, serial_ranges: List[Tuple[int, int]]):
+        if generation != self.search_generation:
+            debug("isearch result discarded, superseded by typing") if debugging else None
+            return
+        for first_serial, last_serial in serial_ranges:
+            if len(self.search_match_ranges) != 0 and self.search_match_ranges[-1][1] == first_serial - 1:
+                self.search_match_ranges[-1] = (self.search_match_ranges[-1][0], last_serial)
             else:
-                matched_row_count = 0
-                model = self.table_view.model()
-                last_column = self.table_view.model().columnCount() - 1
-                # Assume case-insensitive if all text is in lower case.
-                regexp = re.compile(text if regexp_search else re.escape(text),
-                                    flags=re.DOTALL | (re.IGNORECASE if text == text.lower() else 0))
-
-                matching_rows_selection = QItemSelection()
-
-                # matched_row_numbers = [row_num for row_num, journal_entry in enumerate(model.journal_entries)
-                #                        if regexp.search(journal_entry[JOUNO_CONSOLIDATED_TEXT_KEY]) is not None]
-                matched_row_numbers = []
-                self.search_start_time = time.time_ns()
-                my_start_time = self.search_start_time
-                for row_num, journal_entry in enumerate(model.journal_entries):
-                    # Keep processing event loop and stop if a newer search has been started.
-                    # this makes for a responsive interface.
-                    QApplication.processEvents()
-                    if self.search_start_time > my_start_time:
-                        debug("isearch stopped by typing", text) if debugging else None
-                        return
-                    # if journal_entry['MESSAGE'].find(' unregistered') > -1 and journal_entry['MESSAGE'].find(
-                    #         'Service ') > -1:
-                    #     print(journal_entry[JOUNO_CONSOLIDATED_TEXT_KEY])
-                    if regexp.search(journal_entry[JOUNO_CONSOLIDATED_TEXT_KEY]) is not None:
-                        matched_row_numbers.append(row_num)
-                match_count = len(matched_row_numbers)
-                if match_count == 0:
-                    self.journal_status_bar.show_warning(tr("Nothing matches"))
-                elif match_count == len(model.journal_entries):
-                    self.journal_status_bar.show_warning(tr("Everything matches."))
-                else:
-                    for row_n in matched_row_numbers:
-                        row_n_selection = QItemSelection(model.index(row_n, 0), model.index(row_n, last_column))
-                        matching_rows_selection.merge(row_n_selection, QItemSelectionModel.SelectCurrent)
-                    self.scrolled_to_selected = model.index(matching_rows_selection.indexes()[0].row(), 0)
-                    self.table_view.scrollTo(self.scrolled_to_selected)
-                    self.journal_status_bar.show_info(
-                        tr("Matched {match_count} entries.").format(match_count=match_count))
-                self.table_view.selectionModel().select(matching_rows_selection, QItemSelectionModel.SelectCurrent)
-        finally:
-            self.table_view.setEditTriggers(save_triggers)
+                self.search_match_ranges.append((first_serial, last_serial))
+            self.search_matched_serials.extend(range(first_serial, last_serial + 1))
+        row_ranges = list(self.serial_ranges_to_rows(serial_ranges))
+        if len(row_ranges) == 0:
+            return
+        self.search_match_count += sum(last_row - first_row + 1 for first_row, last_row in row_ranges)
+        if self.matches_only:
+            self.table_view.match_proxy.add_matches(serial_ranges)
+        else:
+            self.select_rows(row_ranges)
+        if self.scrolled_to_serial is None:
+            first_row = row_ranges[0][0]
+            self.scrolled_to_serial = self.table_view.journal_model.first_serial + first_row
+            self.table_view.scrollTo(self.table_view.model().index(self.table_view.view_row(first_row), 0))
+        self.journal_status_bar.show_progress(
+            tr("Matched {match_count} entries so far...").format(match_count=self.search_match_count))
+
+    def select_rows(self, row_ranges: List[Tuple[int, int]]):
+        view_model = self.table_view.model()
+        last_column = view_model.columnCount() - 1
+        # One selection range per contiguous run of matches, applied with a single select().
+        matching_rows_selection = QItemSelection()
+        for first_row, last_row in row_ranges:
+            matching_rows_selection.append(
+                QItemSelectionRange(view_model.index(first_row, 0), view_model.index(last_row, last_column)))
+        self.table_view.selectionModel().select(matching_rows_selection, QItemSelectionModel.Select)
+
+    def search_finished(self, generation: int, match_count: int, entry_count: int):
+        if generation != self.search_generation:
+            return
+        if match_count == 0:
+            self.journal_status_bar.show_warning(tr("Nothing matches"))
+        elif match_count == entry_count and not self.matches_only:
+            # Selecting everything is no help, but the matches are kept for showing only matches.
+            self.table_view.clearSelection()
+            self.scrolled_to_serial = None
+            self.journal_status_bar.show_warning(tr("Everything matches."))
+        else:
+            self.journal_status_bar.show_info(
+                tr("Matched {match_count} entries.").format(match_count=self.search_match_count))
+        self.go_next_button.setEnabled(self.scrolled_to_serial is not None)
+        self.go_previous_button.setEnabled(self.scrolled_to_serial is not None)
+
+    def set_matches_only(self, enable: bool):
+        self.matches_only = enable
+        if self.search_regexp is None:
+            return
+        self.table_view.clearSelection()
+        if enable:
+            self.table_view.match_proxy.set_filter(self.search_regexp, self.search_end_serial)
+            self.table_view.match_proxy.add_matches(self.search_match_ranges)
+        else:
+            self.table_view.match_proxy.clear_filter()
+            self.select_rows(list(self.serial_ranges_to_rows(self.search_match_ranges)))
+        if self.scrolled_to_serial is not None:
+            view_row = self.table_view.view_row(self.scrolled_to_serial - self.table_view.journal_model.first_serial)
+            self.table_view.scrollTo(self.table_view.model().index(view_row, 0), QAbstractItemView.PositionAtCenter)
+
+    def serial_ranges_to_rows(self, serial_ranges: List[Tuple[int, int]]) -> Iterator[Tuple[int, int]]:
+        first_retained_serial = self.table_view.journal_model.first_serial
+        for first_serial, last_serial in serial_ranges:
+            # Allow for any entries removed since the search began.
+            first_row = max(first_serial - first_retained_serial, 0)
+            last_row = last_serial - first_retained_serial
+            if last_row >= first_row:
+                yield first_row, last_row
 
     def scroll_selected(self, direction: int):
-        matched_indexes = self.table_view.selectedIndexes()
-        if len(matched_indexes) == 0:
+        model = self.table_view.journal_model
+        if self.table_view.match_proxy.is_filtering():
+            matched_serials = self.table_view.match_proxy.matched_serials
+        else:
+            matched_serials = self.search_matched_serials
+        # Both lists are sorted, matches of entries removed since the search are skipped.
+        first_pos = bisect.bisect_left(matched_serials, model.first_serial)
+        matched_count = len(matched_serials) - first_pos
+        if matched_count == 0:
             return
-        # Reduce the list of all selected row,col items to a list of one item for each row.
-        matched_rows = list({index.row(): index for index in matched_indexes}.values())
-        matched_count = len(matched_rows)
-        if self.scrolled_to_selected is None or self.scrolled_to_selected not in matched_rows:
-            self.scrolled_to_selected = matched_rows[0]
+        scrolled_to_pos = -1 if self.scrolled_to_serial is None \
+            else bisect.bisect_left(matched_serials, self.scrolled_to_serial, first_pos)
+        at_match = 0 <= scrolled_to_pos < len(matched_serials) and matched_serials[scrolled_to_pos] == \
+            self.scrolled_to_serial
+        if not at_match:
+            new_pos = 0
         else:
-            new_pos = matched_rows.index(self.scrolled_to_selected) + direction
+            new_pos = scrolled_to_pos - first_pos + direction
             if new_pos < 0:
                 alert = QMessageBox()
                 alert.setText(tr(f'At first match of {matched_count} matches.'))
@@ -2720,13 +3285,187 @@ class JournalPanel(DockableWidget):
                 alert.setStandardButtons(QMessageBox.Yes | QMessageBox.No)
                 ret = alert.exec()
                 new_pos = 0 if ret == QMessageBox.Yes else matched_count - 1
-            self.scrolled_to_selected = matched_rows[new_pos]
+        # The dialogs above run an event loop, which may have added or removed entries.
+        first_pos = bisect.bisect_left(matched_serials, model.first_serial)
+        if first_pos + new_pos >= len(matched_serials):
+            return
+        self.scrolled_to_serial = matched_serials[first_pos + new_pos]
+        new_row = self.scrolled_to_serial - model.first_serial
+        if at_match:
             self.journal_status_bar.show_info(
-                tr("Match {}/{}, row {}.").format(new_pos + 1, matched_count, self.scrolled_to_selected.row() + 1))
-        self.table_view.scrollTo(self.scrolled_to_selected, QAbstractItemView.PositionAtCenter)
+                tr("Match {}/{}, row {}.").format(new_pos + 1, matched_count, new_row + 1))
+        self.table_view.scrollTo(self.table_view.model().index(self.table_view.view_row(new_row), 0),
+                                 QAbstractItemView.PositionAtCenter)
 
     def set_max_entries(self, max_entries: int) -> None:
-        self.table_view.model().set_max_entries(max_entries)
+        self.table_view.journal_model.set_max_entries(max_entries)
+
+    def set_cursor_only(self, enable: bool) -> None:
+        self.table_view.journal_model.set_cursor_only(enable)
+
+    def set_search_index_enabled(self, enable: bool) -> None:
+        self.table_view.journal_model.set_search_index_enabled(enable)
+
+    def set_collapse_repeats(self, enable: bool) -> None:
+        self.table_view.journal_model.set_collapse_repeats(enable)
+
+    def stop_search_task(self) -> None:
+        self.search_generation = self.search_task.cancel()
+        self.search_task.stop()
+
+
+class JournalSearchTask(QThread):
+    """Searches snapshots of a JournalTableModel's retained entries off the GUI thread."""
+    signal_matches = pyqtSignal(int, list)
+    signal_search_finished = pyqtSignal(int, int, int)
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.requests = queue.Queue()
+        self.generation = 0
+        # Only accessed by the task's thread: (text, ignore_case, matched_serials, end_serial)
+        self.previous_search = None
+
+    def search(self, regexp: re.Pattern, plain_text: Optional[str], first_serial: int,
+               journal_entries: List[Mapping[str, Any]], candidate_rows: Optional[List[int]]) -> int:
+        self.generation += 1
+        self.requests.put((self.generation, regexp, plain_text, first_serial, journal_entries, candidate_rows))
+        return self.generation
+
+    def cancel(self) -> int:
+        self.generation += 1
+        return self.generation
+
+    def stop(self) -> None:
+        """Abandon any search in progress and wait for the thread to end."""
+        self.cancel()
+        self.requests.put(None)
+        self.wait()
+
+    def run(self) -> None:
+        while True:
+            request = self.requests.get()
+            if request is None:
+                return
+            generation, regexp, plain_text, first_serial, journal_entries, candidate_rows = request
+            if generation == self.generation:
+                self.search_snapshot(generation, regexp, plain_text, first_serial, journal_entries, candidate_rows)
+
+    def refined_rows(self, regexp: re.Pattern, plain_text: Optional[str], first_serial: int,
+                     entry_count: int) -> Optional[List[int]]:
+        """If this search refines the previous plain-text search, only its matches and newer entries can match."""
+        if plain_text is None or self.previous_search is None:
+            return None
+        previous_text, previous_ignore_case, previous_serials, previous_end_serial = self.previous_search
+        if previous_ignore_case:
+            refines = previous_text.lower() in plain_text.lower()
+        else:
+            refines = regexp.flags & re.IGNORECASE == 0 and previous_text in plain_text
+        if not refines:
+            return None
+        rows = [serial - first_serial for serial in previous_serials if serial >= first_serial]
+        rows.extend(range(max(previous_end_serial, first_serial) - first_serial, entry_count))
+        debug(f"isearch refining '{previous_text}' to '{plain_text}' {len(rows)} rows") if debugging else None
+        return rows
+
+    def search_snapshot(self, generation: int, regexp: re.Pattern, plain_text: Optional[str], first_serial: int,
+                        journal_entries: List[Mapping[str, Any]], candidate_rows: Optional[List[int]]):
+        rows = self.refined_rows(regexp, plain_text, first_serial, len(journal_entries))
+        if rows is None:
+            rows = range(len(journal_entries)) if candidate_rows is None else candidate_rows
+        elif candidate_rows is not None:
+            rows = sorted(set(rows).intersection(candidate_rows))
+        serial_ranges = []
+        matched_serials = []
+        match_count = 0
+        last_emit_time = time.time()
+        for i, row_num in enumerate(rows):
+            if generation != self.generation:
+                return
+            if regexp.search(journal_entries[row_num][JOUNO_CONSOLIDATED_TEXT_KEY]) is not None:
+                serial = first_serial + row_num
+                if len(serial_ranges) != 0 and serial_ranges[-1][1] == serial - 1:
+                    serial_ranges[-1] = (serial_ranges[-1][0], serial)
+                else:
+                    serial_ranges.append((serial, serial))
+                matched_serials.append(serial)
+                match_count += 1
+            # Stream back what has been found so far every now and then.
+            if i % 256 == 0 and len(serial_ranges) != 0 and time.time() - last_emit_time > 0.1:
+                self.signal_matches.emit(generation, serial_ranges)
+                serial_ranges = []
+                last_emit_time = time.time()
+        if len(serial_ranges) != 0:
+            self.signal_matches.emit(generation, serial_ranges)
+        if plain_text is not None:
+            self.previous_search = (plain_text, regexp.flags & re.IGNORECASE != 0, matched_serials,
+                                    first_serial + len(journal_entries))
+        self.signal_search_finished.emit(generation, match_count, len(journal_entries))
+
+
+class RefreshMetrics:
+    """Frame statistics for the Recent panel's coalesced refresh, including frames dropped by a busy GUI."""
+
+    def __init__(self):
+        self.frame_count = 0
+        self.entry_count = 0
+        self.dropped_frame_count = 0
+        self.max_entries_per_frame = 0
+        self.max_lateness_millis = 0.0
+
+    def record_frame(self, entry_count: int, lateness_millis: float):
+        self.frame_count += 1
+        self.entry_count += entry_count
+        self.max_entries_per_frame = max(self.max_entries_per_frame, entry_count)
+        self.max_lateness_millis = max(self.max_lateness_millis, lateness_millis)
+        dropped = int(lateness_millis // REFRESH_INTERVAL_MSEC)
+        if dropped > 0:
+            self.dropped_frame_count += dropped
+            debug(f"Recent panel refresh {lateness_millis:.0f} ms late, dropped {dropped} frames") if debugging else None
+
+    def __str__(self):
+        return tr("{} refreshes applied {} entries (at most {} at once); {} frames dropped, worst lateness {:.0f} ms.")\
+            .format(self.frame_count, self.entry_count, self.max_entries_per_frame, self.dropped_frame_count,
+                    self.max_lateness_millis)
+
+
+class ExportJournalTask(QThread):
+    """Streams journal entries to a file or the clipboard in text, JSON lines or journal export format."""
+    signal_export_progress = pyqtSignal(int, int)
+    signal_export_finished = pyqtSignal(int, str, str)
+
+    def __init__(self, journal_entries: List[Mapping[str, Any]], export_format: str, file_name: Optional[str]):
+        super().__init__()
+        self.journal_entries = journal_entries
+        self.export_format = export_format
+        self.file_name = file_name
+        self.stopped = False
+
+    def run(self) -> None:
+        count = 0
+        entry_cache = JournalEntryCache()
+        try:
+            with (open(self.file_name, 'wb') if self.file_name is not None else BytesIO()) as out:
+                last_emit_time = time.time()
+                for journal_entry in self.journal_entries:
+                    if self.stopped:
+                        break
+                    if isinstance(journal_entry, CursorOnlyJournalEntry):
+                        journal_entry = entry_cache.get(journal_entry)
+                    write_journal_entry(out, journal_entry, self.export_format)
+                    count += 1
+                    if time.time() - last_emit_time > 0.2:
+                        self.signal_export_progress.emit(count, len(self.journal_entries))
+                        last_emit_time = time.time()
+                clipboard_text = out.getvalue().decode(errors='replace') if self.file_name is None else ''
+            self.signal_export_finished.emit(count, clipboard_text, '')
+        except OSError as e:
+            self.signal_export_finished.emit(count, '', str(e))
+        finally:
+            entry_cache.close()
+
+    def stop(self):
+        self.stopped = True
 
 
 class JournalEntryDelegate(QStyledItemDelegate):
@@ -2743,7 +3482,10 @@ class JournalTableView(QTableView):
     def __init__(self):
         super().__init__()
         self.setToolTip(tr("Double click to view the row's complete journal entry.\nRight-mouse for other options."))
-        self.setModel(JournalTableModel())
+        self.journal_model = JournalTableModel()
+        # The view always shows the proxy, it passes everything through unless filtering for search matches.
+        self.match_proxy = JournalMatchProxyModel(self.journal_model)
+        self.setModel(self.match_proxy)
         self.setDragDropOverwriteMode(False)
         self.resizeColumnsToContents()
         self.setSelectionBehavior(QAbstractItemView.SelectRows)
@@ -2763,8 +3505,171 @@ class JournalTableView(QTableView):
         self.setShowGrid(False)
         self.setIconSize(QSize(30, 30))
 
-    def new_journal_entry(self, journal_entry, notable):
-        self.model().new_journal_entry(journal_entry, notable)
+    def new_journal_entry(self, row_record: JournalRowRecord):
+        self.journal_model.new_journal_entry(row_record)
+
+    def new_journal_entries(self, row_records: List[JournalRowRecord]):
+        self.journal_model.new_journal_entries(row_records)
+
+    def source_row(self, view_row: int) -> int:
+        return self.match_proxy.mapToSource(self.match_proxy.index(view_row, 0)).row()
+
+    def view_row(self, source_row: int) -> int:
+        # Returns -1 if the source row is currently filtered out of the view.
+        return self.match_proxy.mapFromSource(self.journal_model.index(source_row, 0)).row()
+
+    def get_journal_entry(self, view_row: int):
+        return self.journal_model.get_journal_entry(self.source_row(view_row))
+
+
+class JournalMatchProxyModel(QAbstractProxyModel):
+    """Passes a JournalTableModel through to the view, or only the rows matched by a search."""
+
+    def __init__(self, source_model: 'JournalTableModel'):
+        super().__init__()
+        self.filter_regexp: Optional[re.Pattern] = None
+        self.check_from_serial = 0
+        self.matched_serials: List[int] = []
+        # Serial of the source's first row, tracked here so the mapping is always consistent with the source rows.
+        self.source_first_serial = source_model.first_serial
+        self.removing = None
+        self.setSourceModel(source_model)
+        source_model.rowsAboutToBeInserted.connect(self.source_rows_about_to_be_inserted)
+        source_model.rowsInserted.connect(self.source_rows_inserted)
+        source_model.rowsAboutToBeRemoved.connect(self.source_rows_about_to_be_removed)
+        source_model.rowsRemoved.connect(self.source_rows_removed)
+        source_model.dataChanged.connect(self.source_data_changed)
+        source_model.headerDataChanged.connect(self.headerDataChanged)
+
+    def is_filtering(self) -> bool:
+        return self.filter_regexp is not None
+
+    def set_filter(self, regexp: re.Pattern, check_from_serial: int) -> None:
+        """Start filtering, matches before check_from_serial will be supplied by add_matches()."""
+        self.beginResetModel()
+        self.filter_regexp = regexp
+        self.check_from_serial = check_from_serial
+        self.matched_serials = []
+        source_model = self.sourceModel()
+        for row in range(max(check_from_serial - self.source_first_serial, 0), source_model.rowCount()):
+            if self.is_match(row):
+                self.matched_serials.append(self.source_first_serial + row)
+        self.endResetModel()
+
+    def clear_filter(self) -> None:
+        if self.is_filtering():
+            self.beginResetModel()
+            self.filter_regexp = None
+            self.matched_serials = []
+            self.endResetModel()
+
+    def add_matches(self, serial_ranges: List[Tuple[int, int]]) -> None:
+        if not self.is_filtering():
+            return
+        for first_serial, last_serial in serial_ranges:
+            serials = range(max(first_serial, self.source_first_serial), min(last_serial + 1, self.check_from_serial))
+            if len(serials) == 0:
+                continue
+            position = bisect.bisect_left(self.matched_serials, serials[0])
+            self.beginInsertRows(QModelIndex(), position, position + len(serials) - 1)
+            self.matched_serials[position:position] = serials
+            self.endInsertRows()
+
+    def is_match(self, source_row: int) -> bool:
+        journal_entry = self.sourceModel().get_retained_entry(source_row)
+        return self.filter_regexp.search(journal_entry[JOUNO_CONSOLIDATED_TEXT_KEY]) is not None
+
+    def source_serial_positions(self, first_row: int, last_row: int) -> Tuple[int, int]:
+        # The slice of matched_serials that lies within the given source rows.
+        return (bisect.bisect_left(self.matched_serials, self.source_first_serial + first_row),
+                bisect.bisect_right(self.matched_serials, self.source_first_serial + last_row))
+
+    def source_rows_about_to_be_inserted(self, parent: QModelIndex, first_row: int, last_row: int):
+        if not self.is_filtering():
+            self.beginInsertRows(QModelIndex(), first_row, last_row)
+
+    def source_rows_inserted(self, parent: QModelIndex, first_row: int, last_row: int):
+        if not self.is_filtering():
+            self.endInsertRows()
+            return
+        # The source only ever appends.
+        new_serials = [self.source_first_serial + row for row in range(first_row, last_row + 1)
+                       if self.source_first_serial + row >= self.check_from_serial and self.is_match(row)]
+        if len(new_serials) != 0:
+            position = len(self.matched_serials)
+            self.beginInsertRows(QModelIndex(), position, position + len(new_serials) - 1)
+            self.matched_serials.extend(new_serials)
+            self.endInsertRows()
+
+    def source_rows_about_to_be_removed(self, parent: QModelIndex, first_row: int, last_row: int):
+        # The source only ever removes from the front (or removes everything).
+        if not self.is_filtering():
+            self.removing = (first_row, last_row)
+        else:
+            start, end = self.source_serial_positions(first_row, last_row)
+            self.removing = (start, end - 1) if end > start else None
+        if self.removing is not None:
+            self.beginRemoveRows(QModelIndex(), self.removing[0], self.removing[1])
+
+    def source_rows_removed(self, parent: QModelIndex, first_row: int, last_row: int):
+        self.source_first_serial += last_row - first_row + 1
+        if self.removing is not None:
+            if self.is_filtering():
+                del self.matched_serials[self.removing[0]:self.removing[1] + 1]
+            self.removing = None
+            self.endRemoveRows()
+
+    def source_data_changed(self, top_left: QModelIndex, bottom_right: QModelIndex, roles=None):
+        if not self.is_filtering():
+            self.dataChanged.emit(self.index(top_left.row(), top_left.column()),
+                                  self.index(bottom_right.row(), bottom_right.column()))
+            return
+        start, end = self.source_serial_positions(top_left.row(), bottom_right.row())
+        if end > start:
+            self.dataChanged.emit(self.index(start, top_left.column()), self.index(end - 1, bottom_right.column()))
+
+    def mapToSource(self, proxy_index: QModelIndex) -> QModelIndex:
+        if not proxy_index.isValid():
+            return QModelIndex()
+        if not self.is_filtering():
+            return self.sourceModel().index(proxy_index.row(), proxy_index.column())
+        source_row = self.matched_serials[proxy_index.row()] - self.source_first_serial
+        return self.sourceModel().index(source_row, proxy_index.column())
+
+    def mapFromSource(self, source_index: QModelIndex) -> QModelIndex:
+        if not source_index.isValid():
+            return QModelIndex()
+        if not self.is_filtering():
+            return self.index(source_index.row(), source_index.column())
+        serial = self.source_first_serial + source_index.row()
+        position = bisect.bisect_left(self.matched_serials, serial)
+        if position < len(self.matched_serials) and self.matched_serials[position] == serial:
+            return self.index(position, source_index.column())
+        return QModelIndex()
+
+    def index(self, row: int, column: int, parent: QModelIndex = QModelIndex()) -> QModelIndex:
+        if parent.isValid() or not (0 <= row < self.rowCount()) or not (0 <= column < self.columnCount()):
+            return QModelIndex()
+        return self.createIndex(row, column)
+
+    def parent(self, index: QModelIndex = QModelIndex()) -> QModelIndex:
+        return QModelIndex()
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.DisplayRole):
+        if orientation == Qt.Horizontal:
+            # Pass straight through, the default mapping fails when no rows match.
+            return self.sourceModel().headerData(section, orientation, role)
+        return super().headerData(section, orientation, role)
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return len(self.matched_serials) if self.is_filtering() else self.sourceModel().rowCount()
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return self.sourceModel().columnCount()
 
 
 class JournalTableModel(QStandardItemModel):
@@ -2772,20 +3677,70 @@ class JournalTableModel(QStandardItemModel):
     def __init__(self):
         super().__init__(0, 5)
         self.max_entries = 100
-        self.icon_cache = {}
         self.journal_entries = []
+        self.cursor_only = False
+        self.full_entry_cache = JournalEntryCache()
+        # Serial numbers identify entries independently of their current row (rows shift as old entries are removed).
+        self.first_serial = 0
+        self.next_serial = 0
+        self.search_index: Optional[TrigramIndex] = None
+        self.collapse_repeats = False
+        # Repeats folded into a row, by the row's serial, and the record of the last row for detecting them.
+        self.repeats: Mapping[int, RepeatedEntries] = {}
+        self.last_row_record: Optional[JournalRowRecord] = None
         self.setHorizontalHeaderLabels(
             [tr("Time"), tr("Host"), tr("Source"), tr("PID"), tr("Message"), tr("Size (kB)")])
 
     def get_journal_entry(self, row: int):
+        journal_entry = self.journal_entries[row]
+        if isinstance(journal_entry, CursorOnlyJournalEntry):
+            return self.full_entry_cache.get(journal_entry)
+        return journal_entry
+
+    def get_retained_entry(self, row: int):
         return self.journal_entries[row]
 
-    def new_journal_entry(self, journal_entry, notable):
+    def new_journal_entries(self, row_records: List[JournalRowRecord]):
+        if self.max_entries > 0:
+            # Fold repeats first, so that room is only made for the rows that will really be appended.
+            new_row_starts = []
+            last_row_record = self.last_row_record
+            for i, row_record in enumerate(row_records):
+                if not (self.collapse_repeats and last_row_record is not None
+                        and row_record.is_repeat_of(last_row_record)):
+                    new_row_starts.append(i)
+                    last_row_record = row_record
+            # Make room for the whole batch with a single removal.
+            self.remove_oldest_entries(
+                self.rowCount() + min(len(new_row_starts), self.max_entries) - self.max_entries)
+            if len(new_row_starts) > self.max_entries:
+                row_records = row_records[new_row_starts[-self.max_entries]:]
+        for row_record in row_records:
+            self.new_journal_entry(row_record)
+
+    def remove_oldest_entries(self, count: int):
+        if count <= 0:
+            return
+        self.removeRows(0, count)
+        for serial in range(self.first_serial, self.first_serial + count):
+            self.repeats.pop(serial, None)
+        if self.search_index is not None:
+            for serial, removed_entry in enumerate(self.journal_entries[0:count], start=self.first_serial):
+                self.search_index.remove(serial, removed_entry[JOUNO_CONSOLIDATED_TEXT_KEY])
+        del self.journal_entries[0:count]
+        self.first_serial += count
+        if len(self.journal_entries) == 0:
+            self.last_row_record = None
+
+    def new_journal_entry(self, row_record: JournalRowRecord):
+
+        if self.collapse_repeats and self.last_row_record is not None and row_record.is_repeat_of(self.last_row_record):
+            self.add_repeat(row_record)
+            return
 
         if self.max_entries > 0:
-            while self.rowCount() >= self.max_entries:
-                self.removeRow(0)
-                self.journal_entries.pop(0)
+            self.remove_oldest_entries(self.rowCount() + 1 - self.max_entries)
+        self.last_row_record = row_record
 
         def align_right(item: QStandardItem):
             item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
@@ -2796,47 +3751,84 @@ class JournalTableModel(QStandardItemModel):
             return item
 
         def set_icon(item: QStandardItem):
-            priority = journal_entry['PRIORITY'] if 'PRIORITY' in journal_entry else Priority.NOTICE.value
-            if not Priority.EMERGENCY.value <= priority <= Priority.DEBUG.value:
-                priority = Priority.NOTICE.value
-            notification_icon_name = NOTIFICATION_ICONS[Priority(priority)]
-            if True:
-                # New behavior - use "disabled" version of normal icon.
-                full_icon_name = notification_icon_name if notable else notification_icon_name + "_non_notable"
-            else:
-                # Old behavior - use trash can icon.
-                full_icon_name = notification_icon_name = notification_icon_name if notable else 'edit-delete'
-            if full_icon_name in self.icon_cache:
-                icon = self.icon_cache[full_icon_name]
-            else:
-                icon = QIcon.fromTheme(notification_icon_name)
-                self.icon_cache[notification_icon_name] = icon
-                if full_icon_name != notification_icon_name:
-                    icon = create_disabled_icon_from_themed_icon(icon)
-                    self.icon_cache[full_icon_name] = icon
-            item.setIcon(icon)
+            item.setIcon(get_row_record_icon(row_record))
             return item
 
-        self.journal_entries.append(journal_entry)
-
-        consolidated_text = journal_entry[JOUNO_CONSOLIDATED_TEXT_KEY]
-        source = extract_source_from_considated_text(consolidated_text)
-        size_k = f"{len(consolidated_text) / 1024.0:.2f}"
+        journal_entry = row_record.journal_entry
+        retained_entry = \
+            CursorOnlyJournalEntry.from_journal_entry(journal_entry, row_record.source_text) \
+            if self.cursor_only else journal_entry
+        self.journal_entries.append(retained_entry)
+        if self.search_index is not None:
+            self.search_index.add(self.next_serial, retained_entry[JOUNO_CONSOLIDATED_TEXT_KEY])
+        self.next_serial += 1
 
         self.appendRow(
             [
-                selectable(align_right(QStandardItem(f"{journal_entry['__REALTIME_TIMESTAMP']:%y-%m-%d %H:%M:%S}"))),
-                selectable(QStandardItem(journal_entry['_HOSTNAME'] if '_HOSTNAME' in journal_entry else 'UNKNOWN')),
-                selectable(QStandardItem(source)),
-                # TODO smarter choice when _PID is not present.
-                selectable(align_right(QStandardItem(str(journal_entry['_PID'] if '_PID' in journal_entry else '')))),
-                set_icon(selectable(QStandardItem(str(journal_entry['MESSAGE']) if 'MESSAGE' in journal_entry else ''))),
-                selectable(align_right(QStandardItem(size_k))),
+                selectable(align_right(QStandardItem(row_record.time_text))),
+                selectable(QStandardItem(row_record.host_text)),
+                selectable(QStandardItem(row_record.source_text)),
+                selectable(align_right(QStandardItem(row_record.pid_text))),
+                set_icon(selectable(QStandardItem(row_record.message_text))),
+                selectable(align_right(QStandardItem(row_record.size_text))),
             ])
 
+    def add_repeat(self, row_record: JournalRowRecord):
+        # Fold into the last row, only the cursor is kept, the entry can be re-read if the repeats are viewed.
+        row = self.rowCount() - 1
+        first_record = self.last_row_record
+        repeated = self.repeats.setdefault(self.next_serial - 1, RepeatedEntries())
+        repeated.cursors.append(row_record.journal_entry['__CURSOR'])
+        repeated.last_time_text = row_record.time_text
+        self.item(row, 4).setText(tr("{message} [\u00d7{count}]").format(
+            message=first_record.message_text, count=repeated.count()))
+        self.item(row, 0).setToolTip(tr("Repeated {count} times\nFirst: {first}\nLast: {last}").format(
+            count=repeated.count(), first=first_record.time_text, last=repeated.last_time_text))
+
+    def get_repeat_cursors(self, row: int) -> List[str]:
+        repeated = self.repeats.get(self.first_serial + row)
+        return repeated.cursors if repeated is not None else []
+
+    def get_repeated_entries(self, row: int) -> List[Mapping[str, Any]]:
+        """Re-read the entries folded into a collapsed row (not including the row's own entry)."""
+        repeated = self.repeats.get(self.first_serial + row)
+        if repeated is None:
+            return []
+        journal_entries = []
+        for cursor in repeated.cursors:
+            journal_entry = self.full_entry_cache.fetch(cursor)
+            if journal_entry is not None:
+                consolidate_text(journal_entry)
+                journal_entries.append(journal_entry)
+        return journal_entries
+
+    def set_collapse_repeats(self, enable: bool) -> None:
+        self.collapse_repeats = enable
+
     def set_max_entries(self, max_entries: int) -> None:
         self.max_entries = max_entries
 
+    def set_cursor_only(self, enable: bool) -> None:
+        # Only applies to newly added entries, existing entries are left as they are.
+        self.cursor_only = enable
+
+    def set_search_index_enabled(self, enable: bool) -> None:
+        if enable and self.search_index is None:
+            self.search_index = TrigramIndex()
+            for serial, journal_entry in enumerate(self.journal_entries, start=self.first_serial):
+                self.search_index.add(serial, journal_entry[JOUNO_CONSOLIDATED_TEXT_KEY])
+        elif not enable:
+            self.search_index = None
+
+    def find_candidate_rows(self, text: str, regexp_search: bool) -> Optional[List[int]]:
+        """The rows the search index says might match, None if every row has to be checked."""
+        if self.search_index is None:
+            return None
+        candidate_serials = self.search_index.candidates(required_search_literals(text, regexp_search))
+        if candidate_serials is None:
+            return None
+        return sorted(serial - self.first_serial for serial in candidate_serials if serial >= self.first_serial)
+
     def get_max_entries(self) -> int:
         return self.max_entries
 
@@ -2846,6 +3838,168 @@ class JournalTableModel(QStandardItemModel):
     def remove_all_entries(self):
         self.removeRows(0,self.rowCount())
         self.journal_entries = []
+        self.full_entry_cache.clear()
+        self.repeats = {}
+        self.last_row_record = None
+        self.first_serial = self.next_serial
+        if self.search_index is not None:
+            self.search_index = TrigramIndex()
+
+
+class RepeatedEntries:
+    """The later occurrences of a collapsed Recent panel row, kept as cursors to keep memory use down."""
+
+    def __init__(self):
+        self.cursors: List[str] = []
+        self.last_time_text = ''
+
+    def count(self) -> int:
+        return len(self.cursors) + 1
+
+
+# Fields retained by the cursor-only Recent panel: the displayed columns, the priority for the icon, and the cursor.
+CURSOR_ONLY_RETAINED_FIELDS = ['__CURSOR', '__REALTIME_TIMESTAMP', '_HOSTNAME', '_PID', 'MESSAGE', 'PRIORITY']
+
+
+class CursorOnlyJournalEntry(dict):
+    """A journal entry reduced to the Recent panel's displayed fields and its __CURSOR."""
+
+    @staticmethod
+    def from_journal_entry(journal_entry: Mapping[str, Any], source: str) -> 'CursorOnlyJournalEntry':
+        retained = CursorOnlyJournalEntry(
+            (key, journal_entry[key]) for key in CURSOR_ONLY_RETAINED_FIELDS if key in journal_entry)
+        # Keep the retained fields searchable, in the same format as consolidate_text().
+        fields_str = ', '.join((f"'{key}={retained[key]}'" for key in sorted(retained.keys()) if key != '__CURSOR'))
+        retained[JOUNO_CONSOLIDATED_TEXT_KEY] = f"source={source}, {fields_str}"
+        return retained
+
+
+class JournalEntryCache:
+    """A small LRU of full journal entries re-read by cursor on behalf of cursor-only entries."""
+
+    def __init__(self, max_size: int = 32):
+        self.max_size = max_size
+        self.entries: OrderedDict = OrderedDict()
+        self.reader = None
+
+    def get(self, retained_entry: CursorOnlyJournalEntry) -> Mapping[str, Any]:
+        cursor = retained_entry['__CURSOR']
+        if cursor in self.entries:
+            self.entries.move_to_end(cursor)
+            return self.entries[cursor]
+        journal_entry = self.fetch(cursor)
+        if journal_entry is None:
+            # Most likely vacuumed from the journal since it was retained, all we have is what was retained.
+            warning(f"Failed to re-read journal entry {cursor}")
+            return retained_entry
+        consolidate_text(journal_entry)
+        self.entries[cursor] = journal_entry
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+        return journal_entry
+
+    def fetch(self, cursor: str) -> typing.Optional[Mapping[str, Any]]:
+        # Reuse the reader, but reopen it once in case the entry is in a journal file created since it was opened.
+        for attempt in range(2):
+            if self.reader is None:
+                self.reader = journal.Reader()
+            try:
+                self.reader.seek_cursor(cursor)
+                journal_entry = self.reader.get_next()
+                if journal_entry is not None and len(journal_entry) != 0 and self.reader.test_cursor(cursor):
+                    return journal_entry
+            except OSError as e:
+                debug(f"fetch {cursor} failed: {e}") if debugging else None
+            self.reader.close()
+            self.reader = None
+        return None
+
+    def clear(self):
+        self.entries.clear()
+
+    def close(self):
+        self.clear()
+        if self.reader is not None:
+            self.reader.close()
+            self.reader = None
+
+
+class TrigramIndex:
+    """An incrementally maintained, case-folded trigram index of the retained entries' consolidated text."""
+
+    def __init__(self):
+        self.postings: Mapping[str, Set[int]] = {}
+
+    @staticmethod
+    def trigrams(text: str) -> Set[str]:
+        text = text.casefold()
+        return {text[i:i + 3] for i in range(len(text) - 2)}
+
+    def add(self, serial: int, text: str) -> None:
+        for trigram in TrigramIndex.trigrams(text):
+            posting = self.postings.get(trigram)
+            if posting is None:
+                self.postings[trigram] = {serial}
+            else:
+                posting.add(serial)
+
+    def remove(self, serial: int, text: str) -> None:
+        for trigram in TrigramIndex.trigrams(text):
+            posting = self.postings.get(trigram)
+            if posting is not None:
+                posting.discard(serial)
+                if len(posting) == 0:
+                    del self.postings[trigram]
+
+    def candidates(self, required_literals: List[str]) -> Optional[Set[int]]:
+        """Serials of entries containing all the literals, None if the literals are too short to use the index."""
+        query_trigrams = set()
+        for literal in required_literals:
+            query_trigrams |= TrigramIndex.trigrams(literal)
+        if len(query_trigrams) == 0:
+            return None
+        postings = []
+        for trigram in query_trigrams:
+            if trigram not in self.postings:
+                return set()
+            postings.append(self.postings[trigram])
+        postings.sort(key=len)
+        return postings[0].intersection(*postings[1:])
+
+
+def required_search_literals(text: str, regexp_search: bool) -> List[str]:
+    """Literal strings that any match must contain - for regexps only the easily determined ones are returned."""
+    if not regexp_search:
+        return [text]
+    if sre_parse is None:
+        return []
+    try:
+        parsed = sre_parse.parse(text, re.DOTALL)
+    except re.error:
+        return []
+    literals = []
+
+    def walk(sequence) -> None:
+        run = ''
+        for op, av in sequence:
+            if op == sre_parse.LITERAL:
+                run += chr(av)
+                continue
+            literals.append(run)
+            run = ''
+            if op == sre_parse.SUBPATTERN:
+                walk(av[-1])
+            elif op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT) and av[0] >= 1:
+                walk(av[2])
+        literals.append(run)
+
+    try:
+        walk(parsed)
+    except (AttributeError, TypeError, ValueError, IndexError) as e:
+        # The private parser's output isn't as expected, fall back to checking every entry.
+        debug(f"required_search_literals {text}: {e!r}") if debugging else None
+        return []
+    return [literal for literal in literals if len(literal) >= 3]
 
 
 def format_journal_entry(journal_entry):
@@ -2856,12 +4010,60 @@ def format_journal_entry(journal_entry):
     return text
 
 
+def journal_entry_export_value(value: Any) -> bytes:
+    """Undo the systemd.journal.Reader value conversions, as far as is possible, for the journal export format."""
+    return value if isinstance(value, bytes) else journal_value_text(value).encode()
+
+
+def journal_entry_json_value(value: Any) -> Any:
+    """Values JSON can't represent, as journalctl's JSON output has them, binary data as an array of byte values."""
+    return list(value) if isinstance(value, bytes) else journal_value_text(value)
+
+
+def write_journal_entry(out: typing.BinaryIO, journal_entry: Mapping[str, Any], export_format: str) -> None:
+    """Write one entry in text (as format_journal_entry), json (JSON lines) or export (journal export) format."""
+    if export_format == 'json':
+        fields = sorted((k, v) for k, v in journal_entry.items() if k != JOUNO_CONSOLIDATED_TEXT_KEY)
+        out.write(json.dumps(dict(fields), default=journal_entry_json_value).encode())
+        out.write(b'\n')
+    elif export_format == 'export':
+        for key, value in sorted(journal_entry.items()):
+            if key == JOUNO_CONSOLIDATED_TEXT_KEY:
+                continue
+            # A field with several values is exported as the field repeated with each value.
+            for item in value if isinstance(value, list) else [value]:
+                data = journal_entry_export_value(item)
+                if b'\n' in data:
+                    # Binary safe form: the name, a newline, a little-endian 64 bit length, the data.
+                    out.write(key.encode() + b'\n' + len(data).to_bytes(8, 'little') + data + b'\n')
+                else:
+                    out.write(key.encode() + b'=' + data + b'\n')
+        out.write(b'\n')
+    else:
+        out.write((format_journal_entry(journal_entry) + '\n').encode())
+
+
 class ViewTextDialog(QWidget):
+    """Read-only text viewer that renders and searches multi-megabyte entries lazily."""
+
+    RENDER_CHARS_PER_PASS = 256 * 1024
+    SEARCH_DELAY_MSEC = 300
 
-    def __init__(self, title: str, text: str, static_status: str):
-        super().__init__(parent=None, flags=Qt.WindowFlags(Qt.Dialog))
+    def __init__(self, title: str, text: str, static_status: str, parent: QWidget = None):
+        super().__init__(parent=parent, flags=Qt.WindowFlags(Qt.Dialog))
 
         self.setWindowTitle(title)
+        self.text = text
+        # The text as the document holds it, a QTextDocument turns a CRLF into a single block separator.
+        self.document_text = text.replace('\r\n', '\n') if '\r\n' in text else text
+        self.pieces = iter(self.document_text.splitlines(keepends=True))
+        self.rendered_length = 0
+        # Document positions are in UTF-16 code units, which differ from python offsets if there are astral chars.
+        self.has_astral_chars = any(ord(c) > 0xffff for c in text) if not text.isascii() else False
+        self.matches: List[Tuple[int, int]] = []
+        # Further matches are found as they are stepped to, None once all have been found.
+        self.match_iterator: Optional[Iterator[re.Match]] = None
+        self.match_number = -1
 
         title_container = QWidget(self)
         title_layout = QHBoxLayout()
@@ -2875,13 +4077,16 @@ class ViewTextDialog(QWidget):
 
         self.re_search_enabled = False
 
-        def search_entries(text_to_find: str) -> None:
+        def search_entries() -> None:
+            text_to_find = search_input.text()
+            self.matches = []
+            self.match_iterator = None
+            self.match_number = -1
             if text_to_find == '':
                 status_bar.showMessage('')
             else:
                 # Case-insensitive search if text_to_find is all lowercase.
                 re_flags = re.DOTALL | (re.IGNORECASE if text_to_find == text_to_find.lower() else 0)
-                self.scrolled_to_selected = None
                 if self.re_search_enabled:
                     try:
                         matcher = re.compile(text_to_find, flags=re_flags)
@@ -2890,15 +4095,43 @@ class ViewTextDialog(QWidget):
                         return
                 else:
                     matcher = re.compile(re.escape(text_to_find), flags=re_flags)
-                matches = matcher.search(text_view.toPlainText())
-                if matches is not None:
-                    cursor = text_view.textCursor()
-                    cursor.setPosition(matches.start())
-                    cursor.setPosition(matches.end(), QTextCursor.KeepAnchor);
-                    text_view.setTextCursor(cursor)
-                    status_bar.show_info(tr("Matched '{}'").format(text_to_find))
+                self.match_iterator = matcher.finditer(self.document_text)
+                if self.find_next_match():
+                    # Look one match ahead, to know whether there is more than one.
+                    self.find_next_match()
+                if len(self.matches) != 0:
+                    go_to_match(1)
                 else:
                     status_bar.show_warning(tr("No matches."))
+            go_next_button.setEnabled(len(self.matches) > 1)
+            go_previous_button.setEnabled(len(self.matches) > 1)
+
+        def go_to_match(direction: int) -> None:
+            if len(self.matches) == 0:
+                return
+            if direction > 0:
+                if self.match_number + 1 < len(self.matches) or self.find_next_match():
+                    self.match_number += 1
+                else:
+                    self.match_number = 0
+            elif self.match_number > 0:
+                self.match_number -= 1
+            else:
+                # Wrapping back to the last match, so find them all.
+                while self.find_next_match():
+                    pass
+                self.match_number = len(self.matches) - 1
+            start, end = self.matches[self.match_number]
+            self.render_up_to(end)
+            cursor = text_view.textCursor()
+            cursor.setPosition(self.document_position(start))
+            cursor.setPosition(self.document_position(end), QTextCursor.KeepAnchor)
+            text_view.setTextCursor(cursor)
+            text_view.centerCursor()
+            if self.match_iterator is None:
+                status_bar.show_info(tr("Match {}/{}").format(self.match_number + 1, len(self.matches)))
+            else:
+                status_bar.show_info(tr("Match {}/{}+").format(self.match_number + 1, len(self.matches)))
 
         search_input = QLineEdit()
         search_input.setFixedWidth(350)
@@ -2911,17 +4144,46 @@ class ViewTextDialog(QWidget):
             manage_icon(re_action, ICON_REGEXP_SEARCH if enable else ICON_PLAIN_TEXT_SEARCH)
             status_bar.show_info(
                 tr("Regular expression search.") if enable else tr("Plain text search."))
+            if search_input.text() != '':
+                search_timer.start()
 
         re_action.toggled.connect(re_search_toggle)
         search_input.setToolTip(tr(
             "Search journal entry.\n"
-            "Click the icon in the right margin\nto toggle regexp/plain-text matching."))
-        search_input.textEdited.connect(search_entries)
+            "Click the icon in the right margin\nto toggle regexp/plain-text matching.\n"
+            "Press enter for the next match."))
+        # Wait for a pause in typing, each search of a multi-megabyte text takes a while.
+        search_timer = QTimer(self)
+        search_timer.setSingleShot(True)
+        search_timer.setInterval(ViewTextDialog.SEARCH_DELAY_MSEC)
+        search_timer.timeout.connect(search_entries)
+        search_input.textEdited.connect(search_timer.start)
+
+        def return_pressed():
+            if search_timer.isActive():
+                search_timer.stop()
+                search_entries()
+            else:
+                go_to_match(1)
+
+        search_input.returnPressed.connect(return_pressed)
         search_input.setClearButtonEnabled(True)
         title_layout.addWidget(search_input)
 
+        go_next_button = transparent_button(manage_icon(QPushButton('', self), ICON_GO_NEXT))
+        go_next_button.clicked.connect(partial(go_to_match, 1))
+        go_next_button.setEnabled(False)
+        go_next_button.setToolTip(tr("Next match."))
+        title_layout.addWidget(go_next_button)
+
+        go_previous_button = transparent_button(manage_icon(QPushButton('', self), ICON_GO_PREVIOUS))
+        go_previous_button.clicked.connect(partial(go_to_match, -1))
+        go_previous_button.setEnabled(False)
+        go_previous_button.setToolTip(tr("Previous match."))
+        title_layout.addWidget(go_previous_button)
+
         def copy_to_clipboard():
-            QGuiApplication.clipboard().setText(text_view.toPlainText())
+            QGuiApplication.clipboard().setText(self.text)
             status_bar.show_info(tr("Copied all text to the clipboard"), STATUS_TIMEOUT_MSEC)
 
         copy_button = transparent_button(manage_icon(QPushButton('', self), ICON_COPY_TO_CLIPBOARD))
@@ -2934,11 +4196,12 @@ class ViewTextDialog(QWidget):
         layout.addWidget(title_container)
         status_bar = StatusBar()
 
-        text_view = QTextEdit()
+        text_view = QPlainTextEdit()
         text_view.setFont(QFontDatabase.systemFont(QFontDatabase.FixedFont))
         text_view.setReadOnly(True)
-        text_view.setLineWrapMode(QTextEdit.LineWrapMode.NoWrap)
-        text_view.setText(text)
+        text_view.setLineWrapMode(QPlainTextEdit.LineWrapMode.NoWrap)
+        text_view.setUndoRedoEnabled(False)
+        self.text_view = text_view
 
         layout.addWidget(text_view)
         layout.addWidget(status_bar)
@@ -2950,129 +4213,558 @@ class ViewTextDialog(QWidget):
 
         status_bar.addPermanentWidget(QLabel(static_status))
 
+        def scrolled(value: int):
+            # Render more as the end of what has been rendered so far comes into view.
+            scroll_bar = text_view.verticalScrollBar()
+            if value >= scroll_bar.maximum() - scroll_bar.pageStep():
+                self.render_more()
+
+        text_view.verticalScrollBar().valueChanged.connect(scrolled)
+        self.render_more()
+
         # .show() is non-modal, .exec() is modal
         self.show()
 
+    def render_more(self) -> None:
+        self.render_up_to(self.rendered_length + ViewTextDialog.RENDER_CHARS_PER_PASS)
 
-class QueryMetaData(QThread):
-    finished = pyqtSignal(str)
-    progress = pyqtSignal(str)
+    def render_up_to(self, offset: int) -> None:
+        if self.rendered_length >= offset or self.rendered_length >= len(self.document_text):
+            return
+        pieces = []
+        for piece in self.pieces:
+            pieces.append(piece)
+            self.rendered_length += len(piece)
+            if self.rendered_length >= offset:
+                break
+        if len(pieces) != 0:
+            # Appending via a cursor keeps the view's current position and selection.
+            cursor = QTextCursor(self.text_view.document())
+            cursor.movePosition(QTextCursor.End)
+            cursor.insertText(''.join(pieces))
+
+    def find_next_match(self) -> bool:
+        """Find one more non-empty match, returns False once there are no more."""
+        if self.match_iterator is not None:
+            for match in self.match_iterator:
+                if match.end() > match.start():
+                    self.matches.append(match.span())
+                    return True
+            self.match_iterator = None
+        return False
 
-    def __init__(self):
-        super().__init__()
-        self.start_date_map: Mapping[DT.date, QueryBootInfo] = {}
-        self.end_date_map: Mapping[DT.date, QueryBootInfo] = {}
-        self.first_entry_datetime = None
-        self.last_entry_datetime = None
-        self.boot_sequence_list = []
-        self.boot_years = []
-        self.unique_field_values = {}
-        self.stopped = False
+    def document_position(self, offset: int) -> int:
+        if not self.has_astral_chars:
+            return offset
+        return offset + sum(1 for c in self.document_text[0:offset] if ord(c) > 0xffff)
 
-    def run(self) -> None:
-        boot_count = 0
-        try:
-            self.progress.emit(tr("Getting boot data.."))
-            # Run for enough time for the external GUI thread to finish its drawing before it is signaled.
-            self.msleep(1000)
-            with journal.Reader() as reader:
-                boot_id_set = reader.query_unique("_BOOT_ID")
-            for boot_id in boot_id_set:
-                with journal.Reader() as reader:
-                    if self.stopped:
-                        return
-                    reader.this_boot(boot_id)
-                    first = reader.get_next()
-                    start_datetime = first['__REALTIME_TIMESTAMP']
-                    reader.seek_tail()
-                    last = reader.get_previous()
-                    end_datetime = last['__REALTIME_TIMESTAMP']
-                    journal_incomplete = 'MESSAGE' not in last or last['MESSAGE'] != "Journal stopped"
-                    info = QueryBootInfo(boot_id, start_datetime, end_datetime, journal_incomplete)
-                    start_date = start_datetime.date()
-                    end_date = end_datetime.date()
-                    if start_date.year not in self.boot_years:
-                        self.boot_years.append(start_date.year)
-                    if start_date not in self.start_date_map:
-                        self.start_date_map[start_date] = []
-                    if end_date not in self.end_date_map:
-                        self.end_date_map[end_date] = []
-                    self.start_date_map[start_datetime.date()].append(info)
-                    self.end_date_map[end_datetime.date()].append(info)
-                    boot_count += 1
-                    if int(time.time() * 1000) % 500 == 0:
-                        self.progress.emit(tr("Retrieved {} boot details, continuing..").format(boot_count))
-
-            for sublist in self.start_date_map.values():
-                sublist.sort(key=lambda b: b.start_datetime)
-                self.boot_sequence_list.extend(sublist)
-            self.boot_sequence_list.sort(key=lambda b: b.start_datetime)
-            # Incomplete because it's still being written to:
-            self.boot_sequence_list[-1].journal_incomplete = False
-            self.first_entry_datetime = self.boot_sequence_list[0].start_datetime
-            self.last_entry_datetime = self.boot_sequence_list[-1].end_datetime
-            self.boot_years.sort()
-            for i, boot_info in enumerate(self.boot_sequence_list):
-                boot_info.boot_number = i
-            config = Config()
-            query_fields = config.get('options', 'query_field_list', fallback=' '.join(DEFAULT_QUERY_FIELDS)).split(' ')
-            for field_name in query_fields:
-                if self.stopped:
-                    return
-                with journal.Reader() as reader:
-                    values_set = reader.query_unique(field_name)
-                values_list = [QueryFieldValue(field_name, v) for v in values_set]
-                values_list.sort(key=lambda v: v.sort_key)
-                self.progress.emit(tr("Retrieved {} unique values for {}").format(len(values_list), field_name))
-                self.unique_field_values[field_name] = values_list
-        finally:
-            self.finished.emit(tr("Retrieved {} boot details.") if not self.stopped else "Abandoned retrieval.")
 
-    def stop(self):
-        self.stopped = True
+# Where systemd-journald keeps persistent and volatile journal files.
+JOURNAL_DIRECTORIES = ['/var/log/journal', '/run/log/journal']
 
 
-class QueryBootInfo:
-    def __init__(self, boot_id, start_datetime: DT.datetime, end_datetime: DT.datetime, journal_incomplete: bool):
-        self.boot_id = boot_id
-        self.start_datetime = start_datetime
-        self.end_datetime = end_datetime
-        self.journal_incomplete = journal_incomplete
-        self.boot_number = 0
+def journal_file_paths() -> List[str]:
+    paths = []
+    for directory in JOURNAL_DIRECTORIES:
+        for root, dirs, files in os.walk(directory):
+            for name in files:
+                path = os.path.join(root, name)
+                if (name.endswith('.journal') or name.endswith('.journal~')) and os.access(path, os.R_OK):
+                    paths.append(path)
+    return paths
 
 
-def get_name_from_uid(uid: int) -> str:
+def journal_file_identity(path: str) -> Optional[Tuple[Tuple[int, int], Tuple[int, int]]]:
+    """Returns the file's (device, inode), which survives journald renaming it on archive, and its (size, mtime)."""
     try:
-        return pwd.getpwuid(uid).pw_name
-    except KeyError:
-        return str(uid)
+        file_stat = os.stat(path)
+    except OSError:
+        return None
+    return (file_stat.st_dev, file_stat.st_ino), (file_stat.st_size, file_stat.st_mtime_ns)
 
 
-def get_name_from_gid(gid: int) -> str:
-    try:
-        return grp.getgrgid(gid).gr_name
-    except KeyError:
-        return str(gid)
+class JournalMetadataCache:
+    """Each journal file's boots and unique field values, saved between runs in ~/.cache/jouno."""
+    VERSION = 2
+
+    def __init__(self):
+        self.path = get_cache_path('query-metadata.pickle')
+        # By (device, inode): {'path', 'version': (size, mtime), 'cursor', 'boots': {boot_id: (start, end, stopped)},
+        # 'fields': {field_name: {values...}}}, reused while the version is unchanged.
+        self.files: Mapping[Tuple[int, int], Mapping[str, Any]] = {}
+
+    def load(self) -> None:
+        try:
+            with open(self.path, 'rb') as cache_file:
+                version, files = pickle.load(cache_file)
+            if version == JournalMetadataCache.VERSION:
+                self.files = files
+        except FileNotFoundError:
+            pass
+        except (OSError, pickle.PickleError, EOFError, ValueError, TypeError, AttributeError) as e:
+            warning(f"Ignoring unreadable journal metadata cache {self.path}: {e}")
+
+    def save(self) -> None:
+        tmp_path = self.path.with_suffix('.tmp')
+        try:
+            with open(tmp_path, 'wb') as cache_file:
+                pickle.dump((JournalMetadataCache.VERSION, self.files), cache_file)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            warning(f"Failed to save journal metadata cache {self.path}: {e}")
+
+    def retain_only(self, file_keys: List[Tuple[int, int]]) -> None:
+        # Forget journal files that have been vacuumed away.
+        self.files = {file_key: self.files[file_key] for file_key in file_keys if file_key in self.files}
+
+
+class JournalIndex:
+    """A local SQLite FTS5 trigram index of the journal, for substring searches of long time ranges."""
+    VERSION = 2
+
+    def __init__(self):
+        self.path = get_cache_path('journal-index.sqlite')
+        self.connection = sqlite3.connect(str(self.path), timeout=30)
+        try:
+            self.create_tables()
+        except sqlite3.Error:
+            self.connection.close()
+            raise
+
+    def create_tables(self) -> None:
+        # Readers aren't blocked by the indexer's writes.
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        with self.connection:
+            if self.connection.execute("PRAGMA user_version").fetchone()[0] != JournalIndex.VERSION:
+                # Start over with the current layout.
+                for table in ('entries', 'entry_text', 'entry_info', 'state'):
+                    self.connection.execute(f"DROP TABLE IF EXISTS {table}")
+                self.connection.execute(f"PRAGMA user_version = {JournalIndex.VERSION}")
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS entry_info (rowid INTEGER PRIMARY KEY, cursor TEXT, realtime INTEGER, "
+                "boot_id TEXT, hostname TEXT, source TEXT, priority TEXT)")
+            self.connection.execute("CREATE INDEX IF NOT EXISTS entry_info_realtime ON entry_info (realtime)")
+            self.connection.execute("CREATE INDEX IF NOT EXISTS entry_info_boot ON entry_info (boot_id, realtime)")
+            self.connection.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS entry_text USING fts5(text, tokenize='trigram')")
+            self.connection.execute("CREATE TABLE IF NOT EXISTS state (key TEXT PRIMARY KEY, value)")
+
+    @staticmethod
+    def exists() -> bool:
+        return get_cache_path('journal-index.sqlite').exists()
 
+    def close(self) -> None:
+        self.connection.close()
 
-def get_uid_from_name(name: str):
+    def get_state(self, key: str) -> Any:
+        row = self.connection.execute("SELECT value FROM state WHERE key = ?", (key,)).fetchone()
+        return row[0] if row is not None else None
+
+    def add_entries(self, rows: List[Tuple[str, str, int, str, str, str, str]]) -> None:
+        """Add (text, cursor, realtime, boot_id, hostname, source, priority) rows in one transaction."""
+        if len(rows) == 0:
+            return
+        with self.connection:
+            for row in rows:
+                rowid = self.connection.execute(
+                    "INSERT INTO entry_info (cursor, realtime, boot_id, hostname, source, priority) "
+                    "VALUES (?, ?, ?, ?, ?, ?)", row[1:]).lastrowid
+                self.connection.execute("INSERT INTO entry_text (rowid, text) VALUES (?, ?)", (rowid, row[0]))
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO state (key, value) VALUES (?, ?)",
+                [('last_cursor', rows[-1][1]), ('indexed_until', rows[-1][2])])
+
+    def last_cursor(self) -> Optional[str]:
+        return self.get_state('last_cursor')
+
+    def indexed_until(self) -> int:
+        """The time (microseconds) up to which the index covers the journal."""
+        indexed_until = self.get_state('indexed_until')
+        return indexed_until if indexed_until is not None else 0
+
+    def remove_before(self, realtime_usec: int) -> None:
+        # Forget entries that have been vacuumed from the journal.
+        with self.connection:
+            self.connection.execute(
+                "DELETE FROM entry_text WHERE rowid IN (SELECT rowid FROM entry_info WHERE realtime < ?)",
+                (realtime_usec,))
+            self.connection.execute("DELETE FROM entry_info WHERE realtime < ?", (realtime_usec,))
+
+    def search(self, text: str, from_usec: int, to_usec: int, boot_list: List[str]) -> Iterator[str]:
+        """The cursors of entries that may contain text, in time order."""
+        sql = "SELECT entry_info.cursor FROM entry_info JOIN entry_text ON entry_text.rowid = entry_info.rowid " \
+              "WHERE entry_info.realtime BETWEEN ? AND ?"
+        parameters = [from_usec, to_usec]
+        if len(boot_list):
+            sql += " AND entry_info.boot_id IN ({})".format(', '.join('?' * len(boot_list)))
+            parameters += [str(boot_id) for boot_id in boot_list]
+        sql += " AND entry_text MATCH ? ORDER BY entry_info.realtime"
+        parameters.append('"{}"'.format(text.replace('"', '""')))
+        for row in self.connection.execute(sql, parameters):
+            yield row[0]
+
+
+def journal_index_row(journal_entry: Mapping[str, Any]) -> Tuple[str, str, int, str, str, str, str]:
+    """An entry read with raw timestamps, as a JournalIndex row of text, cursor, time, boot and key fields."""
+    realtime_usec = journal_entry['__REALTIME_TIMESTAMP']
+    # Index the same text as the results filter is applied to.
+    decode_realtime(journal_entry)
+    text = consolidate_text(journal_entry)
+    return (text, journal_entry['__CURSOR'], realtime_usec, str(journal_entry.get('_BOOT_ID', '')),
+            str(journal_entry.get('_HOSTNAME', '')), determine_source(journal_entry),
+            str(journal_entry.get('PRIORITY', '')))
+
+
+def scan_journal_file(path: Optional[str], file_metadata: Mapping[str, Any]) -> None:
+    """Find the first and last time of each boot in a journal file (all journals if path is None)."""
+    boots = {}
+    with journal.Reader(files=[path]) if path is not None else journal.Reader() as reader:
+        for boot_id in reader.query_unique("_BOOT_ID"):
+            reader.flush_matches()
+            reader.this_boot(boot_id)
+            reader.seek_head()
+            first = reader.get_next()
+            reader.seek_tail()
+            last = reader.get_previous()
+            if first is None or len(first) == 0 or last is None or len(last) == 0:
+                continue
+            stopped = 'MESSAGE' in last and last['MESSAGE'] == "Journal stopped"
+            boots[boot_id] = (first['__REALTIME_TIMESTAMP'], last['__REALTIME_TIMESTAMP'], stopped)
+        reader.flush_matches()
+        reader.seek_tail()
+        last = reader.get_previous()
+        file_metadata['cursor'] = last['__CURSOR'] if last is not None and len(last) != 0 else None
+    file_metadata['boots'] = boots
+    file_metadata['fields'] = {}
+
+
+def scan_journal_file_appended(path: str, file_metadata: Mapping[str, Any]) -> bool:
+    """Update a file's metadata from the entries appended since its cursor, False if the cursor is gone."""
+    cursor = file_metadata.get('cursor')
+    if cursor is None:
+        return False
+    boots = file_metadata['boots']
+    fields = file_metadata['fields']
+    with journal.Reader(files=[path]) as reader:
+        reader.seek_cursor(cursor)
+        journal_entry = reader.get_next()
+        if journal_entry is None or len(journal_entry) == 0 or not reader.test_cursor(cursor):
+            return False
+        for journal_entry in reader:
+            boot_id = journal_entry.get('_BOOT_ID')
+            realtime = journal_entry['__REALTIME_TIMESTAMP']
+            stopped = 'MESSAGE' in journal_entry and journal_entry['MESSAGE'] == "Journal stopped"
+            if boot_id in boots:
+                start_datetime, end_datetime, previously_stopped = boots[boot_id]
+                if realtime < end_datetime:
+                    stopped = previously_stopped
+                boots[boot_id] = (min(start_datetime, realtime), max(end_datetime, realtime), stopped)
+            elif boot_id is not None:
+                boots[boot_id] = (realtime, realtime, stopped)
+            for field_name, values in fields.items():
+                if field_name in journal_entry:
+                    values.add(journal_entry[field_name])
+            cursor = journal_entry['__CURSOR']
+    file_metadata['cursor'] = cursor
+    return True
+
+
+def scan_journal_file_field(path: Optional[str], field_name: str) -> Set[Any]:
+    with journal.Reader(files=[path]) if path is not None else journal.Reader() as reader:
+        return set(reader.query_unique(field_name))
+
+
+class QueryMetaData(QObject):
+    """The journal's boots and the unique values of the query fields, updated on the GUI thread by each refresh."""
+    field_values_ready = pyqtSignal(str)
+
+    def __init__(self):
+        super().__init__()
+        self.start_date_map: Mapping[DT.date, List[QueryBootInfo]] = {}
+        self.end_date_map: Mapping[DT.date, List[QueryBootInfo]] = {}
+        self.first_entry_datetime = None
+        self.last_entry_datetime = None
+        self.boot_sequence_list = []
+        self.boot_years = []
+        self.unique_field_values = {}
+        self.boot_info_map: Mapping[Any, QueryBootInfo] = {}
+        self.boot_stopped_map: Mapping[Any, bool] = {}
+
+    def update_boots(self, changed_boots: Mapping[Any, Tuple[DT.datetime, DT.datetime, bool]],
+                     removed_boot_ids: List[Any]) -> None:
+        """Apply the boots that are new, changed or gone since the last refresh, leaving the others as they are."""
+        previous_last_boot = self.boot_sequence_list[-1] if len(self.boot_sequence_list) else None
+        renumber_from = len(self.boot_sequence_list)
+        for boot_id in removed_boot_ids:
+            info = self.boot_info_map.pop(boot_id, None)
+            if info is not None:
+                self.unmap_dates(info)
+                renumber_from = min(renumber_from, self.boot_sequence_list.index(info))
+                self.boot_sequence_list.remove(info)
+                del self.boot_stopped_map[boot_id]
+        for boot_id, (start_datetime, end_datetime, stopped) in changed_boots.items():
+            info = self.boot_info_map.get(boot_id)
+            if info is None:
+                info = QueryBootInfo(boot_id, start_datetime, end_datetime, not stopped)
+                self.boot_info_map[boot_id] = info
+                renumber_from = min(renumber_from, insert_by_start(self.boot_sequence_list, info))
+            else:
+                self.unmap_dates(info)
+                start_changed = info.start_datetime != start_datetime
+                if start_changed:
+                    # Older entries of the boot have been vacuumed, it moves in the sequence.
+                    renumber_from = min(renumber_from, self.boot_sequence_list.index(info))
+                    self.boot_sequence_list.remove(info)
+                info.start_datetime, info.end_datetime, info.journal_incomplete = \
+                    start_datetime, end_datetime, not stopped
+                if start_changed:
+                    renumber_from = min(renumber_from, insert_by_start(self.boot_sequence_list, info))
+            self.boot_stopped_map[boot_id] = stopped
+            insert_by_start(self.start_date_map.setdefault(start_datetime.date(), []), info)
+            self.end_date_map.setdefault(end_datetime.date(), []).append(info)
+            if start_datetime.year not in self.boot_years:
+                bisect.insort(self.boot_years, start_datetime.year)
+        for boot_number in range(renumber_from, len(self.boot_sequence_list)):
+            self.boot_sequence_list[boot_number].boot_number = boot_number
+        if len(removed_boot_ids):
+            self.boot_years = sorted({info.start_datetime.year for info in self.boot_sequence_list})
+        if len(self.boot_sequence_list) == 0:
+            self.first_entry_datetime = self.last_entry_datetime = None
+            return
+        if previous_last_boot is not None and previous_last_boot.boot_id in self.boot_info_map:
+            previous_last_boot.journal_incomplete = not self.boot_stopped_map[previous_last_boot.boot_id]
+        # Incomplete because it's still being written to:
+        self.boot_sequence_list[-1].journal_incomplete = False
+        self.first_entry_datetime = self.boot_sequence_list[0].start_datetime
+        self.last_entry_datetime = self.boot_sequence_list[-1].end_datetime
+
+    def unmap_dates(self, info: 'QueryBootInfo') -> None:
+        for date_map, date in ((self.start_date_map, info.start_datetime.date()),
+                               (self.end_date_map, info.end_datetime.date())):
+            date_map[date].remove(info)
+            if len(date_map[date]) == 0:
+                del date_map[date]
+
+    def add_field_values(self, field_name: str, field_values: List['QueryFieldValue']) -> None:
+        self.unique_field_values[field_name] = field_values
+        self.field_values_ready.emit(field_name)
+
+
+class QueryMetaDataTask(QThread):
+    """Refreshes the query metadata from the journal files changed since the last refresh of this session."""
+    finished = pyqtSignal(str, int)
+    progress = pyqtSignal(str)
+    boots_ready = pyqtSignal(object, object)
+    field_values_ready = pyqtSignal(str, object)
+
+    def __init__(self):
+        super().__init__()
+        # Kept for the session, only journal files that have changed are re-read.
+        self.cache: Optional[JournalMetadataCache] = None
+        # The boots as last signalled, each refresh only signals the differences.
+        self.merged_boots: Mapping[Any, Tuple[DT.datetime, DT.datetime, bool]] = {}
+        self.first_run = True
+        self.stopped = False
+        self.refresh_number = 0
+        self.refresh_queued = False
+        self.finished.connect(self.start_queued_refresh)
+
+    def refresh(self) -> int:
+        """Start a refresh, or queue one while a canceled refresh stops, returns the number finished will signal."""
+        if self.isRunning():
+            if self.stopped:
+                self.refresh_queued = True
+                return self.refresh_number + 1
+            return self.refresh_number
+        self.refresh_number += 1
+        self.stopped = False
+        self.start()
+        return self.refresh_number
+
+    def start_queued_refresh(self, _: str, __: int) -> None:
+        if self.refresh_queued:
+            self.refresh_queued = False
+            # Only the end of run() is left to complete.
+            self.wait()
+            self.refresh_number += 1
+            self.stopped = False
+            self.start()
+
+    def run(self) -> None:
+        boot_count = 0
+        refresh_number = self.refresh_number
+        try:
+            self.progress.emit(tr("Getting boot data.."))
+            if self.first_run:
+                # Run for enough time for the external GUI thread to finish its drawing before it is signaled.
+                self.msleep(1000)
+                self.first_run = False
+            config = Config()
+            query_fields = config.get('options', 'query_field_list', fallback=' '.join(DEFAULT_QUERY_FIELDS)).split(' ')
+            if self.cache is None:
+                self.cache = JournalMetadataCache()
+                self.cache.load()
+            cache = self.cache
+            files_metadata = self.scan_journal_files(cache)
+            if files_metadata is None:
+                return
+            merged_boots = {}
+            for path, file_metadata in files_metadata:
+                for boot_id, (start_datetime, end_datetime, stopped) in file_metadata['boots'].items():
+                    if boot_id in merged_boots:
+                        merged_start, merged_end, merged_stopped = merged_boots[boot_id]
+                        if end_datetime < merged_end:
+                            end_datetime, stopped = merged_end, merged_stopped
+                        start_datetime = min(start_datetime, merged_start)
+                    merged_boots[boot_id] = (start_datetime, end_datetime, stopped)
+            if self.stopped:
+                return
+            changed_boots = {boot_id: boot for boot_id, boot in merged_boots.items()
+                             if self.merged_boots.get(boot_id) != boot}
+            removed_boot_ids = [boot_id for boot_id in self.merged_boots if boot_id not in merged_boots]
+            self.merged_boots = merged_boots
+            boot_count = len(merged_boots)
+            # Applied to the QueryMetaData on the GUI thread, where it is read.
+            self.boots_ready.emit(changed_boots, removed_boot_ids)
+            if not self.enumerate_fields(query_fields, files_metadata):
+                return
+            if len(files_metadata) != 0 and files_metadata[0][0] is not None:
+                cache.save()
+        finally:
+            self.finished.emit(tr("Retrieved {} boot details.").format(boot_count)
+                               if not self.stopped else "Abandoned retrieval.", refresh_number)
+
+    def enumerate_fields(self, query_fields: List[str],
+                         files_metadata: List[Tuple[Optional[str], Mapping[str, Any]]]) -> bool:
+        """Fill in each file's values for each field, using worker processes, returns False if stopped."""
+        jobs = [(field_name, path, file_metadata) for field_name in query_fields
+                for path, file_metadata in files_metadata if field_name not in file_metadata['fields']]
+        unscanned_counts = {field_name: 0 for field_name in query_fields}
+        for field_name, _, _ in jobs:
+            unscanned_counts[field_name] += 1
+        for field_name in query_fields:
+            if unscanned_counts[field_name] == 0:
+                # All cached, no need to wait on the workers.
+                self.set_field_values(field_name, files_metadata)
+        if len(jobs) == 0:
+            return True
+        pool = ProcessPoolExecutor(max_workers=min(len(jobs), os.cpu_count() or 4),
+                                   mp_context=multiprocessing.get_context('spawn'))
+        try:
+            futures = {pool.submit(scan_journal_file_field, path, field_name): (field_name, path, file_metadata)
+                       for field_name, path, file_metadata in jobs}
+            pending = set(futures)
+            while len(pending) != 0:
+                # Poll, so a cancel doesn't have to wait for a worker to finish a file.
+                done, pending = wait(pending, timeout=0.5, return_when=FIRST_COMPLETED)
+                for future in done:
+                    if self.stopped:
+                        return False
+                    field_name, path, file_metadata = futures[future]
+                    try:
+                        file_metadata['fields'][field_name] = future.result()
+                    except BrokenProcessPool as e:
+                        # The workers have died, carry on in this process.
+                        warning(f"Worker process failed, scanning {field_name} in journal file {path} here: {e}")
+                        values = self.scan_field_here(path, field_name)
+                        if self.stopped:
+                            return False
+                        file_metadata['fields'][field_name] = values
+                    except Exception as e:
+                        warning(f"Skipping {field_name} in journal file {path}: {e!r}")
+                        file_metadata['fields'][field_name] = set()
+                    unscanned_counts[field_name] -= 1
+                    if unscanned_counts[field_name] == 0:
+                        self.set_field_values(field_name, files_metadata)
+                if self.stopped:
+                    return False
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+        return True
+
+    def scan_field_here(self, path: Optional[str], field_name: str) -> Set[Any]:
+        try:
+            return scan_journal_file_field(path, field_name)
+        except Exception as e:
+            warning(f"Skipping {field_name} in journal file {path}: {e!r}")
+            return set()
+
+    def set_field_values(self, field_name: str, files_metadata: List[Tuple[Optional[str], Mapping[str, Any]]]):
+        values_set = set()
+        for path, file_metadata in files_metadata:
+            values_set.update(file_metadata['fields'][field_name])
+        values_list = [QueryFieldValue(field_name, v) for v in values_set]
+        values_list.sort(key=lambda v: v.sort_key)
+        self.field_values_ready.emit(field_name, values_list)
+
+    def scan_journal_files(self, cache: JournalMetadataCache) -> Optional[List[Tuple[Optional[str], Mapping[str, Any]]]]:
+        """Get the boot metadata for each journal file, from the cache unless the file has changed."""
+        paths = journal_file_paths()
+        if len(paths) == 0:
+            # Can't see the files (unusual journal location?), fall back to scanning everything uncached.
+            debug("No journal files found, metadata will not be cached.") if debugging else None
+            paths = [None]
+        files_metadata = []
+        file_keys = []
+        for file_number, path in enumerate(paths):
+            if self.stopped:
+                return None
+            file_key, file_version = journal_file_identity(path) if path is not None else (None, None)
+            file_metadata = cache.files.get(file_key, None) if path is not None else None
+            try:
+                if file_metadata is None or file_metadata['version'] != file_version:
+                    if file_metadata is None or not scan_journal_file_appended(path, file_metadata):
+                        self.progress.emit(tr("Scanning journal file {} of {}..").format(file_number + 1, len(paths)))
+                        file_metadata = {}
+                        scan_journal_file(path, file_metadata)
+                    file_metadata['path'] = path
+                    file_metadata['version'] = file_version
+                    if path is not None:
+                        cache.files[file_key] = file_metadata
+            except OSError as e:
+                # Most likely rotated or vacuumed while we were looking at it.
+                warning(f"Skipping journal file {path}: {e}")
+                continue
+            files_metadata.append((path, file_metadata))
+            file_keys.append(file_key)
+        if paths != [None]:
+            cache.retain_only(file_keys)
+        return files_metadata
+
+    def stop(self):
+        self.stopped = True
+
+
+class QueryBootInfo:
+    def __init__(self, boot_id, start_datetime: DT.datetime, end_datetime: DT.datetime, journal_incomplete: bool):
+        self.boot_id = boot_id
+        self.start_datetime = start_datetime
+        self.end_datetime = end_datetime
+        self.journal_incomplete = journal_incomplete
+        self.boot_number = 0
+
+
+def insert_by_start(boots: List['QueryBootInfo'], info: 'QueryBootInfo') -> int:
+    """Insert into a list of boots sorted by start time, returns the position, new boots are usually last."""
+    position = len(boots)
+    while position > 0 and boots[position - 1].start_datetime > info.start_datetime:
+        position -= 1
+    boots.insert(position, info)
+    return position
+
+
+def get_name_from_uid(uid: int) -> str:
     try:
-        return pwd.getpwnam(name).pw_uid
+        return pwd.getpwuid(uid).pw_name
     except KeyError:
-        try:
-            return int(name)
-        except ValueError:
-            return -1
+        return str(uid)
 
 
-def get_gid_from_name(name: str):
+def get_name_from_gid(gid: int) -> str:
     try:
-        return pwd.getgrnam(name).gr_gid
+        return grp.getgrgid(gid).gr_name
     except KeyError:
-        try:
-            return int(name)
-        except ValueError:
-            return -1
+        return str(gid)
 
 
 class QueryFieldValue:
@@ -3108,19 +4800,43 @@ class QueryInitializeWidget(QProgressDialog):
             self.step += 1
             self.setValue(self.step)
 
-        def finished_func(message: str):
-            if not query_metadata.stopped:
-                QueryJournalWidget(query_metadata, parent)
+        self.boots_received = False
+
+        def close_dialog():
+            # Closing a QProgressDialog emits canceled, which would stop the task from enumerating field values.
+            self.canceled.disconnect(metadata_task.stop)
             self.close()
 
-        query_metadata = QueryMetaData()
-        query_metadata.progress.connect(progress_func)
-        query_metadata.finished.connect(finished_func)
-        self.canceled.connect(query_metadata.stop)
+        def boots_ready_func(_, __):
+            # The query dialog can open now, it adds field tabs as their values arrive.
+            self.boots_received = True
+            metadata_task.progress.disconnect(progress_func)
+            metadata_task.boots_ready.disconnect(boots_ready_func)
+            if not metadata_task.stopped:
+                QueryJournalWidget(parent.query_metadata, parent)
+            close_dialog()
+
+        def finished_func(message: str, refresh_number: int):
+            if refresh_number != self.refresh_number:
+                # The end of a canceled refresh, this dialog's refresh is queued behind it.
+                return
+            metadata_task.finished.disconnect(finished_func)
+            if not self.boots_received:
+                # Finished without getting as far as the boots (canceled or failed).
+                metadata_task.progress.disconnect(progress_func)
+                metadata_task.boots_ready.disconnect(boots_ready_func)
+                close_dialog()
+
+        metadata_task = parent.get_query_metadata_task()
+        metadata_task.progress.connect(progress_func)
+        metadata_task.boots_ready.connect(boots_ready_func)
+        metadata_task.finished.connect(finished_func)
+        self.canceled.connect(metadata_task.stop)
         self.show()
         self.raise_()
         self.activateWindow()
-        query_metadata.start()
+        # If a canceled refresh is still stopping, this one starts when it has finished.
+        self.refresh_number = metadata_task.refresh()
 
 
 class QueryJournalWidget(QMainWindow):
@@ -3164,7 +4880,24 @@ class QueryJournalWidget(QMainWindow):
         self.limit_rows_widget.setMaximumWidth(150)
         self.limit_rows_widget.setValidator(QIntValidator())
         self.limit_rows_widget.textChanged.connect(row_limit_func)
-        layout.addRow(tr("&Row Limit"), self.limit_rows_widget)
+        self.paged_results_checkbox = QCheckBox(tr("Paged results"))
+        self.paged_results_checkbox.setToolTip(tr(
+            "Only keep the position of each page of results, re-reading pages from the journal as they\n"
+            "are scrolled into view.  Browse huge results in constant memory, but without search or export."))
+        self.latest_rows_checkbox = QCheckBox(tr("Latest"))
+        self.latest_rows_checkbox.setToolTip(tr(
+            "Return the most recent matches within the row limit, scanning backwards from the\n"
+            "end of the time range, rather than the first matches from its start."))
+        self.latest_rows_checkbox.toggled.connect(lambda: self.query_desc_widget.setText(self.query_description()))
+        row_limit_box = QWidget()
+        row_limit_layout = QHBoxLayout()
+        row_limit_box.setLayout(row_limit_layout)
+        row_limit_layout.addWidget(self.limit_rows_widget)
+        row_limit_layout.addWidget(self.latest_rows_checkbox)
+        row_limit_layout.addWidget(self.paged_results_checkbox)
+        row_limit_layout.addStretch()
+        row_limit_layout.setContentsMargins(0, 0, 0, 0)
+        layout.addRow(tr("&Row Limit"), row_limit_box)
 
         def picked_from_date_func(picked_datetime: QDateTime):
             self.from_date_time = picked_datetime.toPyDateTime()
@@ -3200,11 +4933,29 @@ class QueryJournalWidget(QMainWindow):
         tab_widget.addTab(self.boot_picker, "Boot")
 
         self.field_query_widget_list = []
-        for field_name, field_values in self.journal_meta_data.unique_field_values.items():
-            if len(field_values) > 0:
-                field_query_widget = QueryFieldWidget(field_name, field_values, value_checked_func, self)
-                tab_widget.addTab(field_query_widget, field_name)
-                self.field_query_widget_list.append(field_query_widget)
+
+        def field_values_ready_func(field_name: str):
+            field_values = self.journal_meta_data.unique_field_values[field_name]
+            if len(field_values) == 0:
+                return
+            field_query_widget = QueryFieldWidget(field_name, field_values, value_checked_func, self)
+            for i, existing_widget in enumerate(self.field_query_widget_list):
+                if existing_widget.field_name == field_name:
+                    # Refreshed values for a field shown from the previous retrieval.
+                    tab_index = tab_widget.indexOf(existing_widget)
+                    tab_widget.removeTab(tab_index)
+                    tab_widget.insertTab(tab_index, field_query_widget, field_name)
+                    existing_widget.deleteLater()
+                    self.field_query_widget_list[i] = field_query_widget
+                    return
+            tab_widget.addTab(field_query_widget, field_name)
+            self.field_query_widget_list.append(field_query_widget)
+
+        for field_name in list(self.journal_meta_data.unique_field_values.keys()):
+            field_values_ready_func(field_name)
+        # Field values may still be arriving from the metadata workers.
+        self.journal_meta_data.field_values_ready.connect(field_values_ready_func)
+        self.field_values_ready_func = field_values_ready_func
 
         def validate_filter_func(text):
             if text is None:
@@ -3243,12 +4994,55 @@ class QueryJournalWidget(QMainWindow):
         results_filter_edit.setText(self.results_filter)
         layout.addRow(tr("&Results Filter"), filter_box)
 
+        def validate_conditions_func(text: str):
+            try:
+                compile_query_conditions(text)
+                self.query_conditions = text
+                self.run_query_button.setEnabled(True)
+                self.query_desc_widget.setText(self.query_description())
+            except ValueError as e:
+                self.status_bar.show_error(str(e))
+                self.run_query_button.setDisabled(True)
+
+        self.query_conditions = ''
+        self.conditions_edit = QLineEdit()
+        self.conditions_edit.setPlaceholderText(
+            tr("e.g. PRIORITY <= 3 and NOT _UID=0 and _SYSTEMD_UNIT in a.service,b.service"))
+        self.conditions_edit.setToolTip(tr(
+            "Conditions joined by 'and', each FIELD followed by =, !=, <, <=, >, >= or 'in' and a comma separated\n"
+            "list, optionally preceded by NOT.  A condition only holds for entries that have its field.  What can be\n"
+            "done by the journal's own matching is passed to it, the plan shows what is left to be checked in jouno."))
+        self.conditions_edit.textChanged.connect(validate_conditions_func)
+        layout.addRow(tr("&Conditions"), self.conditions_edit)
+
+        self.group_by_fields_edit = QLineEdit()
+        self.group_by_fields_edit.setPlaceholderText(tr("e.g. SYSLOG_IDENTIFIER PRIORITY"))
+        self.group_by_fields_edit.setToolTip(tr(
+            "Space separated fields to count results by when running an aggregation."))
+        self.time_bucket_combo = QComboBox()
+        for bucket_name in AggregateJournalTask.TIME_BUCKETS.keys():
+            self.time_bucket_combo.addItem(tr(bucket_name), bucket_name)
+        self.time_bucket_combo.setToolTip(tr("Also count results by this period of time."))
+        aggregate_box = QWidget()
+        aggregate_layout = QHBoxLayout()
+        aggregate_box.setLayout(aggregate_layout)
+        aggregate_layout.addWidget(self.group_by_fields_edit)
+        aggregate_layout.addWidget(QLabel(tr("per")))
+        aggregate_layout.addWidget(self.time_bucket_combo)
+        aggregate_layout.setContentsMargins(0, 0, 0, 0)
+        layout.addRow(tr("&Group By"), aggregate_box)
+
         button_box = QWidget()
         button_box_layout = QHBoxLayout()
         button_box.setLayout(button_box_layout)
         self.run_query_button = manage_icon(QPushButton(tr("Run Query")), SVG_TOOLBAR_RUN_ENABLED)
         self.run_query_button.clicked.connect(self.perform_query)
         button_box_layout.addWidget(self.run_query_button)
+        self.run_aggregation_button = manage_icon(QPushButton(tr("Run Aggregation")), ICON_AGGREGATE)
+        self.run_aggregation_button.setToolTip(tr(
+            "Count the query's results grouped by the Group By fields and period, without retaining any entries."))
+        self.run_aggregation_button.clicked.connect(self.perform_aggregation)
+        button_box_layout.addWidget(self.run_aggregation_button)
 
         def stop_func():
             self.query_task.stop()
@@ -3268,6 +5062,10 @@ class QueryJournalWidget(QMainWindow):
                 field_widget.reset()
             self.row_limit = 0
             self.limit_rows_widget.setText('0')
+            self.latest_rows_checkbox.setChecked(False)
+            self.group_by_fields_edit.setText('')
+            self.conditions_edit.setText('')
+            self.time_bucket_combo.setCurrentIndex(0)
             self.query_desc_widget.setText(self.query_description())
 
         reset_button = manage_icon(QPushButton(tr("Reset Query")), ICON_REVERT)
@@ -3290,7 +5088,8 @@ class QueryJournalWidget(QMainWindow):
     def query_description(self):
         parts_list = []
         if self.row_limit > 0:
-            parts_list.append("RESULT_COUNT <= {}".format(self.row_limit))
+            parts_list.append("RESULT_COUNT <= {}{}".format(
+                self.row_limit, " latest" if self.latest_rows_checkbox.isChecked() else ""))
         parts_list.append("__REALTIME_TIMESTAMP between [{:%y-%m-%d %H:%M}, {:%y-%m-%d %H:%M}]".format(
             self.from_date_time, self.to_date_time))
         boots = self.boot_picker.get_description()
@@ -3305,62 +5104,169 @@ class QueryJournalWidget(QMainWindow):
             description = field.get_description()
             if description != '':
                 parts_list.append(description)
-        return '\n    and '.join(parts_list)
-
-    def perform_query(self):
-        self.stop_button.setEnabled(True)
-        self.run_query_button.setDisabled(True)
+        if self.query_conditions.strip() != '':
+            parts_list.append(self.query_conditions.strip())
+        description = '\n    and '.join(parts_list)
+        native_matches, residual_conditions, time_ranges, _ = self.plan_query()
+        if len(time_ranges) == 0:
+            return description + "\nplan: no entry can meet the query, nothing to scan"
+        description += "\nplan: scan " + ',\n      '.join(
+            "[{:%y-%m-%d %H:%M}, {:%y-%m-%d %H:%M}]".format(start, end) for start, end in time_ranges)
+        if len(native_matches):
+            description += "\n    journal matches " + '\n    and '.join(
+                "{} in [{}]".format(field, ', '.join(values)) for field, values in native_matches.items())
+        python_parts = ["{}{} {} {}".format('NOT ' if negated else '', field, operator, ','.join(values))
+                        for negated, field, operator, values in residual_conditions]
+        if self.results_filter.strip() != '':
+            python_parts.append("result filter")
+        if len(python_parts):
+            description += "\n    then jouno checks " + ' and '.join(python_parts)
+        return description
+
+    def plan_query(self) -> Tuple[Mapping[str, List[str]], List[Tuple[bool, str, str, List[str]]],
+                                  List[Tuple[DT.datetime, DT.datetime]], List[Any]]:
+        """The native journal matches, the conditions left for Python, the time ranges to scan, and the boots."""
+        native_matches = {f.field_name: [journal_value_text(value) for value in f.get_checked_values()]
+                          for f in self.field_query_widget_list if len(f.get_checked_values())}
+        try:
+            condition_matches, residual_conditions = compile_query_conditions(
+                self.query_conditions)
+        except ValueError:
+            condition_matches, residual_conditions = {}, []
+        nothing_matches = False
+        for field, values in condition_matches.items():
+            if field in native_matches:
+                values = values & set(native_matches[field])
+            native_matches[field] = sorted(values)
+            if len(values) == 0:
+                # Nothing can have this field.
+                nothing_matches = True
+        boot_list = self.boot_picker.boot_list.copy()
+        if '_BOOT_ID' in native_matches and len(boot_list):
+            # The journal ORs matches on the same field, so boot matches are intersected with the picked boots.
+            boot_values = set(native_matches.pop('_BOOT_ID'))
+            boot_list = [boot_id for boot_id in boot_list if journal_value_text(boot_id) in boot_values]
+            if len(boot_list) == 0:
+                nothing_matches = True
+        time_ranges = [] if nothing_matches else plan_query_time_ranges(
+            self.from_date_time, self.to_date_time, boot_list, self.journal_meta_data)
+        return native_matches, residual_conditions, time_ranges, boot_list
+
+    def create_query(self) -> 'JournalQuery':
         if self.results_filter.strip() != '':
             results_filter_pattern = \
                 re.compile(self.results_filter if self.results_filter_is_regexp else re.escape(self.results_filter),
                            flags=re.DOTALL)
         else:
             results_filter_pattern = None
-        self.query_task = QueryJournalTask(
+        native_matches, residual_conditions, time_ranges, boot_list = self.plan_query()
+        return JournalQuery(
             from_datetime=self.from_date_time, to_datetime=self.to_date_time,
-            boot_list=self.boot_picker.boot_list.copy(),
-            field_values_map={f.field_name: f.get_checked_values() for f in self.field_query_widget_list},
+            boot_list=boot_list,
+            field_values_map=native_matches,
             row_limit=self.row_limit,
-            results_filter_pattern=results_filter_pattern)
+            results_filter_pattern=results_filter_pattern,
+            time_ranges=time_ranges,
+            latest=self.latest_rows_checkbox.isChecked(),
+            residual_conditions=residual_conditions,
+            index_text=self.results_filter if self.use_journal_index() else None)
+
+    def use_journal_index(self) -> bool:
+        # The index can find plain text of at least one trigram.
+        return (not self.results_filter_is_regexp and len(self.results_filter) >= 3
+                and self.main_window.journal_indexer.is_enabled() and JournalIndex.exists())
+
+    def perform_query(self):
+        self.stop_button.setEnabled(True)
+        self.run_query_button.setDisabled(True)
+        self.run_aggregation_button.setDisabled(True)
+        query = self.create_query()
+        paged = self.paged_results_checkbox.isChecked()
+        processes = self.main_window.config_panel.get_config().getint('options', 'query_processes', fallback=0) \
+            if query.results_filter_pattern else 1
+        self.query_task = QueryJournalTask(query, paged=paged, processes=processes or os.cpu_count() or 1)
         self.query_task.finished.connect(self.query_finished)
+        # The result view is shown straight away, results are added to it in batches as they are found.
+        if paged:
+            self.result_panel = QueryResultPagedView(query, tr("Query: {}").format(self.query_description()))
+            self.show_result_view(self.result_panel)
+        else:
+            self.result_panel = self.create_result_view()
 
         def progress_func(count: int):
             self.status_bar.show_progress(tr("Found {} entries so far, continuing..").format(count))
+            self.result_panel.static_status_label.setText(tr("Found {} entries so far...").format(count))
+            if paged:
+                self.result_panel.page_model.set_result_count(count)
+
+        def results_func(results: List):
+            if paged:
+                self.result_panel.page_model.add_page_anchors(results)
+            else:
+                self.result_panel.add_journal_entries(results)
+            self.query_task.batch_consumed()
 
         self.query_task.progress.connect(progress_func)
+        self.query_task.results_batch.connect(results_func)
         self.query_task.start()
 
-    def query_finished(self, number_of_matches: int):
-        self.stop_button.setEnabled(False)
-        elapsed_time = self.query_task.time_query_end - self.query_task.time_query_start
-        self.status_bar.show_info(
-            tr("Stopped at {} entries at {:.2f} seconds, creating view.."
-               if self.query_task.stopped else
-               "Retrieved at {} entries in {:.2f} seconds, creating view..").format(number_of_matches, elapsed_time))
-        QApplication.processEvents()
-        query_result = QWidget()
+    def perform_aggregation(self):
+        self.stop_button.setEnabled(True)
+        self.run_query_button.setDisabled(True)
+        self.run_aggregation_button.setDisabled(True)
+        group_by_fields = self.group_by_fields_edit.text().split()
+        time_bucket = self.time_bucket_combo.currentData()
+        aggregate_task = AggregateJournalTask(self.create_query(), group_by_fields, time_bucket)
+        self.query_task = aggregate_task
+        self.result_panel = AggregateResultView(
+            group_by_fields, time_bucket,
+            tr("Aggregation by {}: {}").format(' '.join(group_by_fields + [time_bucket]), self.query_description()))
+        self.show_result_view(self.result_panel)
+
+        def progress_func(count: int):
+            self.status_bar.show_progress(tr("Counted {} entries so far, continuing..").format(count))
+            self.result_panel.static_status_label.setText(tr("Counted {} entries so far...").format(count))
+
+        aggregate_task.progress.connect(progress_func)
+        aggregate_task.finished.connect(partial(self.result_panel.set_counts, aggregate_task.counts))
+        aggregate_task.finished.connect(self.query_finished)
+        aggregate_task.start()
+
+    def create_result_view(self) -> JournalPanel:
+        query_result = QueryResultView()
         query_layout = QVBoxLayout()
         query_result.setLayout(query_layout)
         journal_panel = JournalPanel(max_entries=0)
         title = tr("Query: {}").format(self.query_description())
         journal_panel.title_label.setText(title)
         query_layout.addWidget(journal_panel)
-        for journal_entry in self.query_task.results:
-            if int(time.time() * 1000) % 2000:
-                journal_panel.journal_status_bar.show_info(tr("Initialising."), 1000)
-            journal_panel.add_journal_entry(journal_entry, True)
-        journal_panel.journal_status_bar.showMessage('')
-        journal_panel.static_status_label.setText(
-            tr("Stopped at {} entries at {:.2f} seconds."
-               if self.query_task.stopped else
-               "Retrieved {} entries in {:.2f} seconds.").format(number_of_matches, elapsed_time))
+        query_result.close_func = journal_panel.stop_search_task
+        self.show_result_view(query_result)
+        return journal_panel
+
+    def show_result_view(self, query_result: QWidget) -> None:
         result_geometry = self.main_window.geometry()
         result_geometry.translate(50, 50)
         query_result.setGeometry(result_geometry)
         query_result.show()
         self.query_results.append(query_result)
+
+    def query_finished(self, number_of_matches: int):
+        self.stop_button.setEnabled(False)
+        elapsed_time = self.query_task.time_query_end - self.query_task.time_query_start
+        self.status_bar.show_info(
+            tr("Stopped at {} entries at {:.2f} seconds."
+               if self.query_task.stopped else
+               "Retrieved {} entries in {:.2f} seconds.").format(number_of_matches, elapsed_time))
+        self.result_panel.static_status_label.setText(
+            tr("Stopped at {} entries at {:.2f} seconds."
+               if self.query_task.stopped else
+               "Retrieved {} entries in {:.2f} seconds.").format(number_of_matches, elapsed_time))
+        if isinstance(self.result_panel, QueryResultPagedView):
+            self.result_panel.page_model.set_result_count(number_of_matches)
         self.query_task = None
         self.run_query_button.setEnabled(True)
+        self.run_aggregation_button.setEnabled(True)
 
     def app_restore_state(self):
         debug("app_restore_state") if debugging else None
@@ -3372,67 +5278,862 @@ class QueryJournalWidget(QMainWindow):
             self.restoreState(window_state)
         self.search_container.app_restore_state(from_settings=self.settings, show=True)
 
+    def closeEvent(self, event: QCloseEvent) -> None:
+        # Closed dialogs are kept by the main window, stop them rebuilding their tabs on every refresh.
+        if self.field_values_ready_func is not None:
+            self.journal_meta_data.field_values_ready.disconnect(self.field_values_ready_func)
+            self.field_values_ready_func = None
+        super().closeEvent(event)
+
+
+def datetime_to_usec(date_time: DT.datetime) -> int:
+    return round(date_time.timestamp() * 1_000_000)
+
+
+def decode_realtime(journal_entry: Mapping[str, Any]) -> bool:
+    """Convert a raw microseconds __REALTIME_TIMESTAMP to a datetime, returns True if it needed converting."""
+    realtime = journal_entry['__REALTIME_TIMESTAMP']
+    if isinstance(realtime, int):
+        journal_entry['__REALTIME_TIMESTAMP'] = DT.datetime.fromtimestamp(realtime / 1_000_000)
+        return True
+    return False
+
+
+QUERY_CONDITION_REGEXP = re.compile(r'^((?i:not)\s+)?([A-Z0-9_]+)\s*(<=|>=|!=|=|<|>|\s+(?i:in)\s+)\s*(.*)$')
+# Only an "and" followed by another condition separates conditions, a value may contain " and ".
+QUERY_CONDITION_SEPARATOR_REGEXP = re.compile(
+    r'\s+(?i:and)\s+(?=(?:(?i:not)\s+)?[A-Z0-9_]+\s*(?:<=|>=|!=|=|<|>|\s+(?i:in)\s+))')
+PRIORITY_VALUES = [str(priority) for priority in range(8)]
+
+
+def compile_query_conditions(text: str) -> Tuple[Mapping[str, Set[str]], List[Tuple[bool, str, str, List[str]]]]:
+    """Compile conditions into each field's native journal match values and the conditions left for Python."""
+    native = {}
+    residual = []
+    for condition in QUERY_CONDITION_SEPARATOR_REGEXP.split(text.strip()) if text.strip() != '' else []:
+        match = QUERY_CONDITION_REGEXP.match(condition.strip())
+        if match is None or match.group(4).strip() == '':
+            raise ValueError(tr("Cannot parse query condition: {}").format(condition))
+        negated, field, operator = match.group(1) is not None, match.group(2), match.group(3).strip().lower()
+        values = [value.strip() for value in match.group(4).split(',')] if operator == 'in' \
+            else [match.group(4).strip()]
+        if operator == '!=':
+            negated, operator = not negated, '='
+        if operator in ('<', '<=', '>', '>='):
+            try:
+                bound = float(values[0])
+            except ValueError:
+                raise ValueError(tr("Expected a number in query condition: {}").format(condition))
+            if field != 'PRIORITY':
+                residual.append((negated, field, operator, values))
+                continue
+            compare = {'<': float.__lt__, '<=': float.__le__, '>': float.__gt__, '>=': float.__ge__}[operator]
+            allowed = {p for p in PRIORITY_VALUES if compare(float(p), bound) != negated}
+        elif not negated:
+            allowed = set(values)
+        elif field == 'PRIORITY':
+            allowed = set(PRIORITY_VALUES) - set(values)
+        else:
+            residual.append((negated, field, operator, values))
+            continue
+        native[field] = native[field] & allowed if field in native else allowed
+    return native, residual
+
+
+def journal_value_text(value: Any) -> str:
+    """A value decoded by the journal reader's converters, as the text the journal holds."""
+    if isinstance(value, uuid.UUID):
+        return value.hex
+    if isinstance(value, bytes):
+        return value.decode('utf-8', errors='replace')
+    if isinstance(value, DT.datetime):
+        return str(datetime_to_usec(value))
+    if isinstance(value, DT.timedelta):
+        return str(value // DT.timedelta(microseconds=1))
+    if isinstance(value, journal.Monotonic):
+        return journal_value_text(value.timestamp)
+    return str(value)
+
+
+def query_condition_holds(journal_entry: Mapping[str, Any], condition: Tuple[bool, str, str, List[str]]) -> bool:
+    negated, field, operator, values = condition
+    if field not in journal_entry:
+        return False
+    # A field may have several values, the condition is about any of them.
+    field_values = journal_entry[field] if isinstance(journal_entry[field], list) else [journal_entry[field]]
+    texts = [journal_value_text(value) for value in field_values]
+    if operator in ('=', 'in'):
+        return any(text in values for text in texts) != negated
+    numbers = []
+    for text in texts:
+        try:
+            numbers.append(float(text))
+        except ValueError:
+            pass
+    if len(numbers) == 0:
+        return False
+    compare = {'<': float.__lt__, '<=': float.__le__, '>': float.__gt__, '>=': float.__ge__}[operator]
+    return any(compare(number, float(values[0])) for number in numbers) != negated
+
+
+def plan_query_time_ranges(from_datetime: DT.datetime, to_datetime: DT.datetime, boot_list: List[str],
+                           query_metadata: QueryMetaData) -> List[Tuple[DT.datetime, DT.datetime]]:
+    """The query's time range intersected with the times of its boots, the last may still be running."""
+    if len(boot_list) == 0:
+        return [(from_datetime, to_datetime)]
+    latest_boot = query_metadata.boot_sequence_list[-1] if len(query_metadata.boot_sequence_list) else None
+    ranges = []
+    for boot_id in boot_list:
+        boot_info = query_metadata.boot_info_map.get(boot_id)
+        if boot_info is None:
+            # Nothing known about this boot, nothing can be pruned.
+            return [(from_datetime, to_datetime)]
+        start_datetime = max(from_datetime, boot_info.start_datetime)
+        end_datetime = to_datetime if boot_info is latest_boot else min(to_datetime, boot_info.end_datetime)
+        if start_datetime <= end_datetime:
+            ranges.append((start_datetime, end_datetime))
+    merged_ranges = []
+    for start_datetime, end_datetime in sorted(ranges):
+        if len(merged_ranges) and start_datetime <= merged_ranges[-1][1]:
+            merged_ranges[-1] = (merged_ranges[-1][0], max(end_datetime, merged_ranges[-1][1]))
+        else:
+            merged_ranges.append((start_datetime, end_datetime))
+    return merged_ranges
 
-class QueryJournalTask(QThread):
-    finished = pyqtSignal(int)
-    progress = pyqtSignal(int)
+
+class JournalQuery:
+    """The criteria of a journal query, shared by the query task and anything that re-reads its results."""
 
     def __init__(self,
                  from_datetime: DT.datetime, to_datetime: DT.datetime,
                  boot_list: List[str],
                  field_values_map: Mapping[str, List],
                  row_limit: int,
-                 results_filter_pattern: re.Pattern):
-        super().__init__()
+                 results_filter_pattern: Optional[re.Pattern],
+                 time_ranges: Optional[List[Tuple[DT.datetime, DT.datetime]]] = None,
+                 latest: bool = False,
+                 residual_conditions: Optional[List[Tuple[bool, str, str, List[str]]]] = None,
+                 index_text: Optional[str] = None):
         self.from_datetime = from_datetime
         self.to_datetime = to_datetime
         self.boot_list = boot_list
         self.field_values_map = field_values_map
         self.row_limit = row_limit
         self.results_filter_pattern = results_filter_pattern
-        self.results = []
+        self.time_ranges = time_ranges if time_ranges is not None else [(from_datetime, to_datetime)]
+        self.to_usec = datetime_to_usec(to_datetime)
+        # Return the last row_limit results rather than the first.
+        self.latest = latest and row_limit > 0
+        # Conditions that couldn't be expressed as journal matches, see compile_query_conditions().
+        self.residual_conditions = residual_conditions if residual_conditions is not None else []
+        # Text to look up in the JournalIndex to find candidate results.
+        self.index_text = index_text
+
+    def open_reader(self) -> journal.Reader:
+        # Leave timestamps as raw microseconds, they're only decoded for entries that get shown.
+        reader = journal.Reader(converters={'__REALTIME_TIMESTAMP': int})
+        for boot_id in self.boot_list:
+            reader.this_boot(boot_id)
+        for field_name, field_values in self.field_values_map.items():
+            for value in field_values:
+                match_str = "{}={}".format(field_name, value)
+                reader.add_match(match_str)
+        return reader
+
+    def is_after_end(self, journal_entry: Mapping[str, Any], end_usec: Optional[int] = None) -> bool:
+        return journal_entry['__REALTIME_TIMESTAMP'] > (self.to_usec if end_usec is None else end_usec)
+
+    def partitions(self, count: int) -> List[Tuple[DT.datetime, DT.datetime, bool]]:
+        """Split the planned time ranges into about count (start, end, end_is_inclusive) partitions."""
+        total_seconds = sum((end - start).total_seconds() for start, end in self.time_ranges)
+        partitions = []
+        for start, end in self.time_ranges:
+            range_count = max(1, round(count * (end - start).total_seconds() / total_seconds)) \
+                if total_seconds > 0 else 1
+            length = (end - start) / range_count
+            boundaries = [start + length * i for i in range(range_count)] + [end]
+            partitions += [(boundaries[i], boundaries[i + 1], i == range_count - 1) for i in range(range_count)]
+        return partitions
+
+    def is_result(self, journal_entry: Mapping[str, Any]) -> bool:
+        for condition in self.residual_conditions:
+            if not query_condition_holds(journal_entry, condition):
+                return False
+        if self.results_filter_pattern is None:
+            return True
+        decode_realtime(journal_entry)
+        text = consolidate_text(journal_entry)
+        return self.results_filter_pattern.search(text) is not None
+
+    def decoded(self, journal_entry: Mapping[str, Any]) -> Mapping[str, Any]:
+        """Complete a result read by this query's reader so that it can be shown."""
+        if decode_realtime(journal_entry) or JOUNO_CONSOLIDATED_TEXT_KEY not in journal_entry:
+            consolidate_text(journal_entry)
+        return journal_entry
+
+
+def query_partitions(query: JournalQuery, partitions: List[Tuple[DT.datetime, DT.datetime, bool, Any]],
+                     paged: bool, stop_event: Any) -> None:
+    """Runs in a worker process: query each of (start, end, end_is_inclusive, results_queue) in turn."""
+    for partition_start, partition_end, end_is_inclusive, results_queue in partitions:
+        if stop_event.is_set():
+            return
+        query_partition(query, partition_start, partition_end, end_is_inclusive, paged, results_queue, stop_event)
+
+
+def query_partition(query: JournalQuery, partition_start: DT.datetime, partition_end: DT.datetime,
+                    end_is_inclusive: bool, paged: bool, results_queue: Any, stop_event: Any) -> None:
+    """Runs in a worker process, streaming a partition's results back in bounded chunks of builtin types."""
+    number_of_matches = 0
+    chunk = []
+    chunk_time = time.time()
+    end_usec = datetime_to_usec(partition_end)
+    with query.open_reader() as reader:
+        reader.seek_realtime(partition_start)
+        while not stop_event.is_set():
+            journal_entry = reader.get_next()
+            if journal_entry is None or len(journal_entry) == 0:
+                break
+            realtime = journal_entry['__REALTIME_TIMESTAMP']
+            if realtime > end_usec or (realtime == end_usec and not end_is_inclusive):
+                break
+            if query.is_result(journal_entry):
+                if not paged:
+                    chunk.append(journal_entry)
+                elif number_of_matches % QueryResultPageModel.PAGE_SIZE == 0:
+                    chunk.append((number_of_matches, journal_entry['__CURSOR']))
+                number_of_matches += 1
+                if 0 < query.row_limit == number_of_matches:
+                    break
+            # Also send when matches are sparse, so the parent can report progress.
+            if len(chunk) >= QueryJournalTask.BATCH_MAX_ENTRIES or \
+                    time.time() - chunk_time > QueryJournalTask.BATCH_SECONDS:
+                if not put_until_stopped(results_queue, (number_of_matches, chunk, False), stop_event):
+                    return
+                chunk = []
+                chunk_time = time.time()
+    put_until_stopped(results_queue, (number_of_matches, chunk, True), stop_event)
+
+
+def put_until_stopped(results_queue: Any, message: Any, stop_event: Any) -> bool:
+    while not stop_event.is_set():
+        try:
+            results_queue.put(message, timeout=0.25)
+            return True
+        except queue.Full:
+            pass
+    return False
+
+
+class QueryJournalTask(QThread):
+    """Runs a query, delivering results in batches, scanning partitions in worker processes if allowed."""
+    PARTITIONS_PER_PROCESS = 4
+    PARTITION_CHUNKS_IN_FLIGHT = 4
+    finished = pyqtSignal(int)
+    progress = pyqtSignal(int)
+    results_batch = pyqtSignal(list)
+
+    BATCH_SECONDS = 0.1
+    BATCH_MAX_ENTRIES = 2000
+    MAX_BATCHES_IN_FLIGHT = 4
+    PROGRESS_SECONDS = 0.25
+
+    def __init__(self, query: JournalQuery, paged: bool = False, processes: int = 1):
+        super().__init__()
+        self.query = query
+        self.paged = paged
+        self.processes = processes
+        self.batch = []
+        self.batch_time = 0.0
+        self.batches_in_flight = threading.Semaphore(QueryJournalTask.MAX_BATCHES_IN_FLIGHT)
         self.stopped = False
         self.time_query_start = 0.0
         self.time_query_end = 0.0
+        self.last_progress_time = time.time()
 
     def run(self):
+        if self.query.latest:
+            self.run_latest()
+            return
+        if self.query.index_text is not None:
+            self.run_indexed()
+            return
+        if self.processes > 1 and len(self.query.time_ranges) and self.query.to_datetime > self.query.from_datetime:
+            self.run_partitioned()
+            return
+        number_of_matches = 0
         try:
             self.time_query_start = time.time()
-            number_of_matches = 0
-            with journal.Reader() as query_reader:
-                query_reader.seek_realtime(self.from_datetime)
-                for boot_id in self.boot_list:
-                    query_reader.this_boot(boot_id)
-                for field_name, field_values in self.field_values_map.items():
-                    for value in field_values:
-                        match_str = "{}={}".format(field_name, value)
-                        query_reader.add_match(match_str)
-                while True:
-                    if self.stopped:
+            with self.query.open_reader() as query_reader:
+                for range_start, range_end in self.query.time_ranges:
+                    # Seek straight to the start of each planned range, skipping what lies between them.
+                    query_reader.seek_realtime(range_start)
+                    number_of_matches = self.scan(query_reader, datetime_to_usec(range_end), number_of_matches)
+                    if self.stopped or self.is_at_row_limit(number_of_matches):
                         break
-                    journal_entry = query_reader.get_next()
-                    # at end of journal returns {} an empty dictionary
-                    if journal_entry is None or len(journal_entry) == 0:
+        finally:
+            self.deliver_batch(number_of_matches)
+            self.time_query_end = time.time()
+            self.finished.emit(number_of_matches)
+
+    def scan(self, query_reader: journal.Reader, end_usec: int, number_of_matches: int) -> int:
+        """Read on from the reader's position to end_usec, returns the number of matches so far."""
+        while not self.stopped and not self.is_at_row_limit(number_of_matches):
+            journal_entry = query_reader.get_next()
+            # at end of journal returns {} an empty dictionary
+            if journal_entry is None or len(journal_entry) == 0:
+                break
+            if self.query.is_after_end(journal_entry, end_usec):
+                break
+            if self.query.is_result(journal_entry):
+                number_of_matches += 1
+                self.add_match(journal_entry, number_of_matches)
+            self.check_time(number_of_matches)
+        return number_of_matches
+
+    def check_time(self, number_of_matches: int) -> None:
+        """Checked on every entry scanned: deliver a partial batch that has aged, report progress regularly."""
+        now = time.time()
+        if len(self.batch) and now - self.batch_time > QueryJournalTask.BATCH_SECONDS:
+            self.deliver_batch(number_of_matches)
+        if now - self.last_progress_time > QueryJournalTask.PROGRESS_SECONDS:
+            self.progress.emit(number_of_matches)
+            self.last_progress_time = now
+
+    def add_match(self, journal_entry: Mapping[str, Any], number_of_matches: int) -> None:
+        if not self.paged:
+            self.add_result(JournalRowRecord(self.query.decoded(journal_entry), True), number_of_matches)
+        elif (number_of_matches - 1) % QueryResultPageModel.PAGE_SIZE == 0:
+            self.add_result(journal_entry['__CURSOR'], number_of_matches)
+
+    def is_at_row_limit(self, number_of_matches: int) -> bool:
+        return 0 < self.query.row_limit <= number_of_matches
+
+    def run_indexed(self):
+        """Look up candidate results in the JournalIndex, scanning only the part of the range not yet indexed."""
+        number_of_matches = 0
+        index = None
+        try:
+            self.time_query_start = time.time()
+            try:
+                index = JournalIndex()
+                indexed_until_usec = index.indexed_until()
+            except sqlite3.Error as e:
+                warning(f"Journal index: cannot be opened, scanning the journal instead: {e}")
+                if index is not None:
+                    index.close()
+                    index = None
+            with self.query.open_reader() as query_reader:
+                for range_start, range_end in self.query.time_ranges:
+                    range_start_usec, range_end_usec = datetime_to_usec(range_start), datetime_to_usec(range_end)
+                    scan_from_usec, scan_from_cursor = range_start_usec, None
+                    if index is not None:
+                        try:
+                            for cursor in index.search(self.query.index_text, range_start_usec,
+                                                       min(range_end_usec, indexed_until_usec), self.query.boot_list):
+                                if self.stopped or self.is_at_row_limit(number_of_matches):
+                                    break
+                                query_reader.seek_cursor(cursor)
+                                journal_entry = query_reader.get_next()
+                                # The entry may be gone, or the seek may have skipped on to another that meets
+                                # the matches.
+                                if journal_entry is None or len(journal_entry) == 0 \
+                                        or not query_reader.test_cursor(cursor):
+                                    continue
+                                scan_from_cursor = cursor
+                                if self.query.is_result(journal_entry):
+                                    number_of_matches += 1
+                                    self.add_match(journal_entry, number_of_matches)
+                                self.check_time(number_of_matches)
+                            scan_from_usec, scan_from_cursor = max(range_start_usec, indexed_until_usec + 1), None
+                        except sqlite3.Error as e:
+                            # Carry on from the last entry found by reading the journal, as if there were no index.
+                            warning(f"Journal index: query failed, scanning the journal instead: {e}")
+                            index.close()
+                            index = None
+                    if index is None or range_end_usec > indexed_until_usec:
+                        if scan_from_cursor is not None:
+                            query_reader.seek_cursor(scan_from_cursor)
+                            query_reader.get_next()
+                        else:
+                            query_reader.seek_realtime(scan_from_usec)
+                        number_of_matches = self.scan(query_reader, range_end_usec, number_of_matches)
+                    self.progress.emit(number_of_matches)
+                    if self.stopped or self.is_at_row_limit(number_of_matches):
                         break
-                    journal_entry_date_time = journal_entry['__REALTIME_TIMESTAMP']
-                    if journal_entry_date_time.replace(tzinfo=pytz.UTC) > self.to_datetime.replace(tzinfo=pytz.UTC):
+        finally:
+            if index is not None:
+                index.close()
+            self.deliver_batch(number_of_matches)
+            self.time_query_end = time.time()
+            self.finished.emit(number_of_matches)
+
+    def run_latest(self):
+        """Scan backwards from the end of the time range until row_limit results are found."""
+        number_of_matches = 0
+        try:
+            self.time_query_start = time.time()
+            latest_results = []
+            last_progress_time = time.time()
+            with self.query.open_reader() as query_reader:
+                for range_start, range_end in reversed(self.query.time_ranges):
+                    # Seek just past the (inclusive) end, the previous entry is then the last one in range.
+                    query_reader.seek_realtime(range_end + DT.timedelta(microseconds=1))
+                    range_start_usec = datetime_to_usec(range_start)
+                    while len(latest_results) < self.query.row_limit:
+                        if self.stopped:
+                            break
+                        journal_entry = query_reader.get_previous()
+                        if journal_entry is None or len(journal_entry) == 0:
+                            break
+                        if journal_entry['__REALTIME_TIMESTAMP'] < range_start_usec:
+                            break
+                        if self.query.is_result(journal_entry):
+                            latest_results.append(journal_entry['__CURSOR'] if self.paged else journal_entry)
+                        if time.time() - last_progress_time > QueryJournalTask.PROGRESS_SECONDS:
+                            self.progress.emit(len(latest_results))
+                            last_progress_time = time.time()
+                    if self.stopped or len(latest_results) == self.query.row_limit:
                         break
-                    text = consolidate_text(journal_entry)
-                    if self.results_filter_pattern is None or self.results_filter_pattern.search(text) is not None:
-                        number_of_matches += 1
-                        self.results.append(journal_entry)
-                    if int(time.time() * 1000) % 1000 == 0:
-                        self.progress.emit(number_of_matches)
-                    if self.row_limit > 0 and number_of_matches == self.row_limit:
+            for result in reversed(latest_results):
+                number_of_matches += 1
+                if not self.paged:
+                    self.add_result(JournalRowRecord(self.query.decoded(result), True), number_of_matches)
+                elif (number_of_matches - 1) % QueryResultPageModel.PAGE_SIZE == 0:
+                    self.add_result(result, number_of_matches)
+        finally:
+            self.deliver_batch(number_of_matches)
+            self.time_query_end = time.time()
+            self.finished.emit(number_of_matches)
+
+    def run_partitioned(self):
+        number_of_matches = 0
+        stop_event = None
+        workers = []
+        try:
+            self.time_query_start = time.time()
+            context = multiprocessing.get_context('spawn')
+            stop_event = context.Event()
+            partitions = self.query.partitions(self.processes * QueryJournalTask.PARTITIONS_PER_PROCESS)
+            queues = [context.Queue(maxsize=QueryJournalTask.PARTITION_CHUNKS_IN_FLIGHT) for _ in partitions]
+            # Each worker takes every n-th partition, in order, so the partition being waited on is always running.
+            workers = [context.Process(target=query_partitions, daemon=True, args=(
+                self.query, [partitions[i] + (queues[i],) for i in range(n, len(partitions), self.processes)],
+                self.paged, stop_event)) for n in range(self.processes)]
+            for worker in workers:
+                worker.start()
+            for partition_number, results_queue in enumerate(queues):
+                # Read each partition in turn, so results are delivered in order.
+                first_match = number_of_matches
+                partition_anchors = []
+                while not self.stopped and not self.is_at_row_limit(number_of_matches):
+                    try:
+                        partition_matches, results, done = results_queue.get(timeout=0.25)
+                    except queue.Empty:
+                        if not workers[partition_number % self.processes].is_alive() and results_queue.empty():
+                            warning(f"Query partition {partition_number} worker has exited unexpectedly.")
+                            break
+                        self.check_time(number_of_matches)
+                        continue
+                    if not self.paged:
+                        for journal_entry in results:
+                            if self.is_at_row_limit(number_of_matches):
+                                break
+                            number_of_matches += 1
+                            self.add_match(journal_entry, number_of_matches)
+                    else:
+                        partition_anchors += [cursor for _, cursor in results]
+                        partition_matches = first_match + partition_matches
+                        if self.query.row_limit > 0:
+                            partition_matches = min(partition_matches, self.query.row_limit)
+                        # A page may start part way through a partition's page, it's anchored by a cursor and skip.
+                        page_size = QueryResultPageModel.PAGE_SIZE
+                        page_start = -(-number_of_matches // page_size) * page_size
+                        while page_start < partition_matches:
+                            offset = page_start - first_match
+                            self.add_result((partition_anchors[offset // QueryResultPageModel.PAGE_SIZE],
+                                             offset % QueryResultPageModel.PAGE_SIZE), page_start + 1)
+                            page_start += QueryResultPageModel.PAGE_SIZE
+                        number_of_matches = partition_matches
+                    self.check_time(number_of_matches)
+                    if done:
                         break
+                if self.stopped or self.is_at_row_limit(number_of_matches):
+                    break
         finally:
+            if stop_event is not None:
+                stop_event.set()
+            for worker in workers:
+                worker.join(timeout=2.0)
+                if worker.is_alive():
+                    worker.terminate()
+            self.deliver_batch(number_of_matches)
             self.time_query_end = time.time()
             self.finished.emit(number_of_matches)
 
+    def add_result(self, result: Union[JournalRowRecord, str, Tuple[str, int]], number_of_matches: int):
+        if len(self.batch) == 0:
+            self.batch_time = time.time()
+        self.batch.append(result)
+        # The first result goes out on its own, so something appears as soon as possible.
+        if number_of_matches == 1 or len(self.batch) >= QueryJournalTask.BATCH_MAX_ENTRIES or \
+                time.time() - self.batch_time > QueryJournalTask.BATCH_SECONDS:
+            self.deliver_batch(number_of_matches)
+
+    def deliver_batch(self, number_of_matches: int):
+        if len(self.batch) == 0:
+            return
+        # Wait for the GUI to catch up if too many batches are waiting to be added to the view.
+        while not self.batches_in_flight.acquire(timeout=0.5):
+            if self.stopped:
+                return
+        self.results_batch.emit(self.batch)
+        self.progress.emit(number_of_matches)
+        self.last_progress_time = time.time()
+        self.batch = []
+
+    def batch_consumed(self):
+        self.batches_in_flight.release()
+
     def stop(self):
         self.stopped = True
 
 
+class QueryResultPageModel(QAbstractTableModel):
+    """Query results re-read from the journal a page at a time as they're scrolled into view."""
+    PAGE_SIZE = 200
+    MAX_CACHED_PAGES = 8
+
+    def __init__(self, query: JournalQuery):
+        super().__init__()
+        self.query = query
+        self.page_anchors: List[str] = []
+        self.result_count = 0
+        self.row_count = 0
+        self.pages: OrderedDict = OrderedDict()
+        self.pages_requested: Set[int] = set()
+        self.headers = [tr("Time"), tr("Host"), tr("Source"), tr("PID"), tr("Message"), tr("Size (kB)")]
+        # Pages are read off the GUI thread, a sparse results filter may mean reading a long way for a page.
+        self.fetch_task = QueryPageFetchTask(query, self.page_anchors)
+        self.fetch_task.page_fetched.connect(self.page_fetched)
+        self.fetch_task.start()
+
+    def add_page_anchors(self, page_anchors: List[Union[str, Tuple[str, int]]]) -> None:
+        self.page_anchors.extend(page_anchors)
+        self.update_row_count()
+
+    def set_result_count(self, result_count: int) -> None:
+        self.result_count = max(self.result_count, result_count)
+        self.update_row_count()
+
+    def update_row_count(self) -> None:
+        # Rows are only available once the anchor for their page has arrived.
+        new_row_count = min(self.result_count, len(self.page_anchors) * QueryResultPageModel.PAGE_SIZE)
+        if new_row_count > self.row_count:
+            self.beginInsertRows(QModelIndex(), self.row_count, new_row_count - 1)
+            self.row_count = new_row_count
+            self.endInsertRows()
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else self.row_count
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.headers)
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.DisplayRole):
+        if role == Qt.DisplayRole:
+            return self.headers[section] if orientation == Qt.Horizontal else str(section + 1)
+        return None
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        column = index.column()
+        if role == Qt.TextAlignmentRole:
+            return int(Qt.AlignRight | Qt.AlignVCenter) if column in (0, 3, 5) else None
+        if role not in (Qt.DisplayRole, Qt.DecorationRole):
+            return None
+        row_record = self.get_row_record(index.row())
+        if row_record is None:
+            return None
+        if role == Qt.DecorationRole:
+            return get_row_record_icon(row_record) if column == 4 else None
+        return (row_record.time_text, row_record.host_text, row_record.source_text, row_record.pid_text,
+                row_record.message_text, row_record.size_text)[column]
+
+    def get_row_record(self, row: int) -> Optional[JournalRowRecord]:
+        page_number, offset = divmod(row, QueryResultPageModel.PAGE_SIZE)
+        page = self.get_page(page_number)
+        return page[offset] if page is not None and offset < len(page) else None
+
+    def get_journal_entry(self, row: int) -> Optional[Mapping[str, Any]]:
+        row_record = self.get_row_record(row)
+        return row_record.journal_entry if row_record is not None else None
+
+    def get_page(self, page_number: int) -> Optional[List[JournalRowRecord]]:
+        """The page if it has been read, otherwise None, and the page will be read in the background."""
+        if page_number in self.pages:
+            self.pages.move_to_end(page_number)
+            return self.pages[page_number]
+        if page_number not in self.pages_requested:
+            self.pages_requested.add(page_number)
+            self.fetch_task.fetch(page_number)
+        return None
+
+    def page_fetched(self, page_number: int, page: List[JournalRowRecord]) -> None:
+        self.pages_requested.discard(page_number)
+        self.pages[page_number] = page
+        while len(self.pages) > QueryResultPageModel.MAX_CACHED_PAGES:
+            self.pages.popitem(last=False)
+        first_row = page_number * QueryResultPageModel.PAGE_SIZE
+        last_row = min(first_row + QueryResultPageModel.PAGE_SIZE, self.row_count) - 1
+        if last_row >= first_row:
+            self.dataChanged.emit(self.index(first_row, 0), self.index(last_row, len(self.headers) - 1))
+
+    def close(self) -> None:
+        self.fetch_task.stop()
+        self.pages.clear()
+        self.pages_requested.clear()
+
+
+class QueryPageFetchTask(QThread):
+    """Reads pages of query results from the journal for a QueryResultPageModel, most recently requested first."""
+    page_fetched = pyqtSignal(int, list)
+
+    def __init__(self, query: JournalQuery, page_anchors: List[Union[str, Tuple[str, int]]]):
+        super().__init__()
+        self.query = query
+        # Only appended to by the GUI thread, and a page is only requested once its anchor has arrived.
+        self.page_anchors = page_anchors
+        self.requests = queue.LifoQueue()
+        self.stopped = False
+
+    def fetch(self, page_number: int) -> None:
+        self.requests.put(page_number)
+
+    def stop(self) -> None:
+        self.stopped = True
+        self.requests.put(None)
+        self.wait()
+
+    def run(self) -> None:
+        reader = None
+        try:
+            while not self.stopped:
+                page_number = self.requests.get()
+                if page_number is None:
+                    break
+                try:
+                    if reader is None:
+                        reader = self.query.open_reader()
+                    page = self.fetch_page(reader, page_number)
+                except OSError as e:
+                    warning(f"Failed to read query results page {page_number}: {e}")
+                    page = []
+                    if reader is not None:
+                        reader.close()
+                        reader = None
+                if not self.stopped:
+                    self.page_fetched.emit(page_number, page)
+        finally:
+            if reader is not None:
+                reader.close()
+
+    def fetch_page(self, reader: journal.Reader, page_number: int) -> List[JournalRowRecord]:
+        page = []
+        # An anchor is a cursor, or a cursor and how many results to skip to reach the page.
+        anchor = self.page_anchors[page_number]
+        cursor, skip = anchor if isinstance(anchor, tuple) else (anchor, 0)
+        reader.seek_cursor(cursor)
+        while len(page) < QueryResultPageModel.PAGE_SIZE and not self.stopped:
+            journal_entry = reader.get_next()
+            if journal_entry is None or len(journal_entry) == 0 or self.query.is_after_end(journal_entry):
+                break
+            if self.query.is_result(journal_entry):
+                if skip > 0:
+                    skip -= 1
+                    continue
+                page.append(JournalRowRecord(self.query.decoded(journal_entry), True))
+        return page
+
+
+class QueryResultView(QWidget):
+    """A result window for query results retrieved into a JournalPanel."""
+
+    def __init__(self):
+        super().__init__()
+        self.close_func: Optional[Callable[[], None]] = None
+
+    def closeEvent(self, event: QCloseEvent) -> None:
+        if self.close_func is not None:
+            self.close_func()
+            self.close_func = None
+        super().closeEvent(event)
+
+
+class QueryResultPagedView(QWidget):
+    """A result window for paged query results."""
+
+    def __init__(self, query: JournalQuery, title: str):
+        super().__init__()
+        layout = QVBoxLayout()
+        self.setLayout(layout)
+        self.title_label = big_label(QLabel(title))
+        layout.addWidget(self.title_label)
+
+        self.page_model = QueryResultPageModel(query)
+        table_view = QTableView()
+        table_view.setModel(self.page_model)
+        table_view.setToolTip(tr("Double click to view the row's complete journal entry."))
+        table_view.setSelectionBehavior(QAbstractItemView.SelectRows)
+        table_view.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        table_view.setShowGrid(False)
+        table_view.setIconSize(QSize(30, 30))
+        table_view.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        table_view.setColumnWidth(0, 15 * 14)
+        table_view.setColumnWidth(1, 10 * 14)
+        table_view.setColumnWidth(2, 10 * 14)
+        table_view.setColumnWidth(3, 5 * 14)
+        table_view.setColumnWidth(4, 8 * 14)
+        table_view.horizontalHeader().setSectionResizeMode(4, QHeaderView.Stretch)
+        table_view.horizontalHeader().setDefaultAlignment(Qt.AlignLeft)
+        layout.addWidget(table_view)
+
+        self.status_bar = StatusBar()
+        self.static_status_label = QLabel("")
+        self.status_bar.addPermanentWidget(self.static_status_label)
+        layout.addWidget(self.status_bar)
+
+        def view_journal_entry_at_index(index: QModelIndex):
+            journal_entry = self.page_model.get_journal_entry(index.row())
+            if journal_entry is None:
+                self.status_bar.show_warning(tr("Entry {} is no longer available.").format(index.row() + 1))
+                return
+            window_title = tr("Query Result #{row} \u2014 {entry}").format(
+                row=index.row() + 1, entry=journal_entry['__REALTIME_TIMESTAMP'])
+            status = tr("{kb:.2f} kbytes").format(kb=len(journal_entry[JOUNO_CONSOLIDATED_TEXT_KEY]) / 1024.0)
+            ViewTextDialog(title=window_title, text=format_journal_entry(journal_entry), static_status=status)
+
+        table_view.doubleClicked.connect(view_journal_entry_at_index)
+
+    def closeEvent(self, event: QCloseEvent) -> None:
+        self.page_model.close()
+        super().closeEvent(event)
+
+
+class AggregateJournalTask(QThread):
+    """Counts a query's results by the values of the group-by fields and by time bucket."""
+    finished = pyqtSignal(int)
+    progress = pyqtSignal(int)
+
+    TIME_BUCKETS = {'all time': None, 'minute': DT.timedelta(minutes=1), 'hour': DT.timedelta(hours=1),
+                    'day': DT.timedelta(days=1)}
+    PROGRESS_SECONDS = 0.25
+
+    def __init__(self, query: JournalQuery, group_by_fields: List[str], time_bucket: str):
+        super().__init__()
+        self.query = query
+        self.group_by_fields = group_by_fields
+        self.bucket_length = AggregateJournalTask.TIME_BUCKETS[time_bucket]
+        self.counts: Mapping[Tuple, int] = {}
+        self.stopped = False
+        self.time_query_start = 0.0
+        self.time_query_end = 0.0
+
+    def bucket_start(self, realtime_usec: int) -> DT.datetime:
+        # Local time, so that buckets start on the hour or day as displayed.
+        start = DT.datetime.fromtimestamp(realtime_usec / 1_000_000)
+        if self.bucket_length >= DT.timedelta(days=1):
+            return start.replace(hour=0, minute=0, second=0, microsecond=0)
+        if self.bucket_length >= DT.timedelta(hours=1):
+            return start.replace(minute=0, second=0, microsecond=0)
+        return start.replace(second=0, microsecond=0)
+
+    def run(self):
+        number_of_entries = 0
+        try:
+            self.time_query_start = time.time()
+            last_progress_time = time.time()
+            # Entries arrive in time order, so the bucket only needs recalculating when an entry falls outside it.
+            bucket, bucket_start_usec, bucket_end_usec = None, 0, 0
+            with self.query.open_reader() as query_reader:
+                for range_start, range_end in self.query.time_ranges:
+                    query_reader.seek_realtime(range_start)
+                    range_end_usec = datetime_to_usec(range_end)
+                    while not self.stopped:
+                        journal_entry = query_reader.get_next()
+                        if journal_entry is None or len(journal_entry) == 0:
+                            break
+                        if self.query.is_after_end(journal_entry, range_end_usec):
+                            break
+                        if not self.query.is_result(journal_entry):
+                            continue
+                        number_of_entries += 1
+                        if self.bucket_length is not None:
+                            realtime_usec = journal_entry['__REALTIME_TIMESTAMP']
+                            if isinstance(realtime_usec, DT.datetime):
+                                realtime_usec = datetime_to_usec(realtime_usec)
+                            if not bucket_start_usec <= realtime_usec < bucket_end_usec:
+                                bucket = self.bucket_start(realtime_usec)
+                                bucket_start_usec = datetime_to_usec(bucket)
+                                bucket_end_usec = datetime_to_usec(bucket + self.bucket_length)
+                        key = (bucket,) + tuple(str(journal_entry.get(field, '')) for field in self.group_by_fields)
+                        self.counts[key] = self.counts.get(key, 0) + 1
+                        if time.time() - last_progress_time > AggregateJournalTask.PROGRESS_SECONDS:
+                            self.progress.emit(number_of_entries)
+                            last_progress_time = time.time()
+                    if self.stopped:
+                        break
+        finally:
+            self.time_query_end = time.time()
+            self.finished.emit(number_of_entries)
+
+    def stop(self):
+        self.stopped = True
+
+
+class AggregateResultView(QWidget):
+    """A result window for an aggregation, a sortable table of counts."""
+
+    def __init__(self, group_by_fields: List[str], time_bucket: str, title: str):
+        super().__init__()
+        layout = QVBoxLayout()
+        self.setLayout(layout)
+        self.title_label = big_label(QLabel(title))
+        layout.addWidget(self.title_label)
+        self.with_time = AggregateJournalTask.TIME_BUCKETS[time_bucket] is not None
+        self.model = QStandardItemModel(0, 0)
+        self.model.setHorizontalHeaderLabels(
+            ([tr("Time")] if self.with_time else []) + group_by_fields + [tr("Count")])
+        self.table_view = QTableView()
+        self.table_view.setModel(self.model)
+        self.table_view.setSortingEnabled(True)
+        self.table_view.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table_view.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table_view.horizontalHeader().setDefaultAlignment(Qt.AlignLeft)
+        self.table_view.horizontalHeader().setStretchLastSection(True)
+        layout.addWidget(self.table_view)
+
+        self.status_bar = StatusBar()
+        self.static_status_label = QLabel("")
+        self.status_bar.addPermanentWidget(self.static_status_label)
+        layout.addWidget(self.status_bar)
+
+    def set_counts(self, counts: Mapping[Tuple, int], _: int = 0) -> None:
+        for key, count in counts.items():
+            bucket, values = key[0], key[1:]
+            row = [QStandardItem(f"{bucket:%y-%m-%d %H:%M}")] if self.with_time else []
+            row += [QStandardItem(value) for value in values]
+            count_item = QStandardItem()
+            # Numeric data, so the column sorts by number.
+            count_item.setData(count, Qt.DisplayRole)
+            count_item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+            row.append(count_item)
+            self.model.appendRow(row)
+        self.table_view.sortByColumn(self.model.columnCount() - 1, Qt.DescendingOrder)
+        self.table_view.resizeColumnsToContents()
+
+
 class QueryBootWidget(QWidget):
     def __init__(self, journal_metadata: QueryMetaData, boot_picked_func: Callable, parent: QWidget):
         super().__init__(parent=parent)
@@ -3681,6 +6382,66 @@ class QueryBootCalendar(QCalendarWidget):
             painter.restore()
 
 
+class QueryFieldValueModel(QAbstractListModel):
+    """The checkable values of a query field, optionally narrowed to those starting with a prefix."""
+
+    def __init__(self, field_name: str, field_values: List[QueryFieldValue]):
+        super().__init__()
+        self.field_name = field_name
+        self.field_values = field_values
+        self.checked_rows: Set[int] = set()
+        self.visible_rows: List[int] = list(range(len(field_values)))
+        self.prefix_index = sorted((v.description.casefold(), i) for i, v in enumerate(field_values))
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.visible_rows)
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole) -> Any:
+        if not index.isValid():
+            return None
+        field_value = self.field_values[self.visible_rows[index.row()]]
+        if role == Qt.DisplayRole:
+            return field_value.description
+        if role == Qt.CheckStateRole:
+            return Qt.Checked if self.visible_rows[index.row()] in self.checked_rows else Qt.Unchecked
+        if role == Qt.ToolTipRole:
+            return "{}={} ({})".format(self.field_name, field_value.value, field_value.description)
+        return None
+
+    def setData(self, index: QModelIndex, value: Any, role: int = Qt.EditRole) -> bool:
+        if not index.isValid() or role != Qt.CheckStateRole:
+            return False
+        if value == Qt.Checked:
+            self.checked_rows.add(self.visible_rows[index.row()])
+        else:
+            self.checked_rows.discard(self.visible_rows[index.row()])
+        self.dataChanged.emit(index, index, [Qt.CheckStateRole])
+        return True
+
+    def flags(self, index: QModelIndex) -> Qt.ItemFlags:
+        return Qt.ItemIsEnabled | Qt.ItemIsUserCheckable if index.isValid() else Qt.NoItemFlags
+
+    def set_prefix_filter(self, prefix: str) -> None:
+        self.beginResetModel()
+        if prefix == '':
+            self.visible_rows = list(range(len(self.field_values)))
+        else:
+            prefix = prefix.casefold()
+            start = bisect.bisect_left(self.prefix_index, (prefix,))
+            end = bisect.bisect_left(self.prefix_index, (prefix + '\U0010ffff',))
+            # Keep the field's own value order.
+            self.visible_rows = sorted(i for _, i in self.prefix_index[start:end])
+        self.endResetModel()
+
+    def get_checked_values(self) -> List[QueryFieldValue]:
+        return [self.field_values[i] for i in sorted(self.checked_rows)]
+
+    def uncheck_all(self) -> None:
+        self.checked_rows.clear()
+        if len(self.visible_rows):
+            self.dataChanged.emit(self.index(0), self.index(len(self.visible_rows) - 1), [Qt.CheckStateRole])
+
+
 class QueryFieldWidget(QGroupBox):
     def __init__(self, field_name: str, field_values: List, value_checked_func: Callable, parent: QueryJournalWidget):
         super().__init__('', parent=parent)
@@ -3689,32 +6450,33 @@ class QueryFieldWidget(QGroupBox):
         layout = QVBoxLayout()
         self.setLayout(layout)
 
-        scroll_area = QScrollArea()
-        scroll_area.setWidgetResizable(True)
-        checkbox_container = QWidget(scroll_area)
-        checkbox_container_layout = QGridLayout()
-        checkbox_container.setLayout(checkbox_container_layout)
-        scroll_area.setWidget(checkbox_container)
-        scroll_area.setContentsMargins(0, 0, 0, 0)
-        checkbox_container_layout.setSizeConstraint(QLayout.SizeConstraint.SetMinimumSize)
-        layout.addWidget(scroll_area)
-        # self.setFlat(True)
-        max_str_len = max(len(str(v.description)) for v in field_values)
-        num_cols = 5 if max_str_len < 20 else (100 // max_str_len)
-        self.checkbox_list = []
-        for i, field_value in enumerate(field_values):
-            tooltip = "{}={} ({})".format(field_name, field_value.value, field_value.description)
-            checkbox = QCheckBox(field_value.description)
-            checkbox.setToolTip(tooltip)
-            if value_checked_func is not None:
-                checkbox.stateChanged.connect(value_checked_func)
-            self.checkbox_list.append(checkbox)
-            checkbox_container_layout.addWidget(checkbox, i // num_cols, i % num_cols, Qt.AlignLeft)
-        # Stop the inter-cell spacing from expanding by consuming it with spacers
-        v_spacer = QSpacerItem(QSizePolicy.Expanding, QSizePolicy.Expanding)
-        checkbox_container_layout.addItem(v_spacer, checkbox_container_layout.rowCount(), 0, 1, -1)
-        h_spacer = QSpacerItem(QSizePolicy.Expanding, QSizePolicy.Minimum)
-        checkbox_container_layout.addItem(h_spacer, 0, checkbox_container_layout.columnCount(), -1, 1)
+        self.values_model = QueryFieldValueModel(field_name, field_values)
+        prefix_filter_edit = QLineEdit()
+        prefix_filter_edit.setPlaceholderText(tr("Show values starting with..."))
+        prefix_filter_edit.setClearButtonEnabled(True)
+        count_label = QLabel(tr("{} values").format(len(field_values)))
+        filter_box = QWidget()
+        filter_layout = QHBoxLayout()
+        filter_box.setLayout(filter_layout)
+        filter_layout.addWidget(prefix_filter_edit)
+        filter_layout.addWidget(count_label)
+        filter_layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(filter_box)
+
+        values_view = QListView()
+        values_view.setModel(self.values_model)
+        values_view.setUniformItemSizes(True)
+        values_view.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        layout.addWidget(values_view)
+
+        def prefix_filter_func(text: str):
+            self.values_model.set_prefix_filter(text)
+            count_label.setText(tr("{} of {} values").format(self.values_model.rowCount(), len(field_values))
+                                if text != '' else tr("{} values").format(len(field_values)))
+
+        prefix_filter_edit.textChanged.connect(prefix_filter_func)
+        if value_checked_func is not None:
+            self.values_model.dataChanged.connect(value_checked_func)
 
         def as_csv() -> str:
             csv_text = field_name + ', Description\n'
@@ -3731,20 +6493,18 @@ class QueryFieldWidget(QGroupBox):
             QApplication.clipboard().setText(as_csv())
 
         def context_menu_func(point: QPoint):
-            menu = QMenu(checkbox_container)
+            menu = QMenu(values_view)
             manage_icon(menu.addAction(tr('View as CSV'), view_text_func), ICON_VIEW_JOURNAL_ENTRY)
             manage_icon(menu.addAction(tr('&Copy as CSV'), copy_func), ICON_COPY_SELECTED)
-            menu.exec(checkbox_container.mapToGlobal(point))
+            menu.exec(values_view.mapToGlobal(point))
 
-        checkbox_container.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
-        checkbox_container.customContextMenuRequested.connect(context_menu_func)
+        values_view.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
+        values_view.customContextMenuRequested.connect(context_menu_func)
 
     def get_checked_values(self):
-        if self.field_name == '_UID':
-            return [get_uid_from_name(checkbox.text()) for checkbox in self.checkbox_list if checkbox.isChecked()]
-        elif self.field_name == '_GID':
-            return [get_gid_from_name(checkbox.text()) for checkbox in self.checkbox_list if checkbox.isChecked()]
-        return [checkbox.text() for checkbox in self.checkbox_list if checkbox.isChecked()]
+        if self.field_name in ('_UID', '_GID'):
+            return [field_value.value for field_value in self.values_model.get_checked_values()]
+        return [field_value.description for field_value in self.values_model.get_checked_values()]
 
     def get_description(self):
         values = self.get_checked_values()
@@ -3756,13 +6516,7 @@ class QueryFieldWidget(QGroupBox):
             return "{} in [{}]".format(self.field_name, ', '.join([str(v) for v in values]))
 
     def reset(self):
-        for checkbox in self.checkbox_list:
-            checkbox.setChecked(False)
-    # def resizeEvent(self, a0: QResizeEvent) -> None:
-    #     num_cols = self.width() / 300
-    #     for i, box in enumerate(self.boxes):
-    #         self.grid_layout.removeWidget(box)
-    #         self.grid_layout.addWidget(box, i / num_cols, i % num_cols, Qt.AlignLeft)
+        self.values_model.uncheck_all()
 
 
 class DialogSingletonMixin: